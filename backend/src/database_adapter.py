@@ -9,9 +9,17 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 from bson import ObjectId
 import json
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+class DuplicateKeyError(Exception):
+    """Raised when a write would violate a unique index"""
+    
+    def __init__(self, field: Optional[str] = None):
+        super().__init__(f"Duplicate value for unique field '{field}'" if field else "Duplicate key")
+        self.field = field
+
 class DatabaseAdapter:
     """Database adapter that works with both TinyDB and MongoDB"""
     
@@ -52,11 +60,17 @@ class DatabaseAdapter:
         """Setup MongoDB connection"""
         from pymongo import MongoClient
         
+        # Keep a warm pool so concurrent requests don't pay connection setup.
+        # Cosmos DB's MongoDB API does not support retryable writes.
         self.client = MongoClient(
             connection_string,
             serverSelectionTimeoutMS=5000,
             ssl=True,
-            retryWrites=False
+            retryWrites=False,
+            maxPoolSize=int(os.getenv('MONGO_MAX_POOL', 200)),
+            minPoolSize=int(os.getenv('MONGO_MIN_POOL', 10)),
+            maxIdleTimeMS=int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 300000)),
+            waitQueueTimeoutMS=int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 2000))
         )
         
         # Test connection
@@ -102,6 +116,29 @@ class DatabaseAdapter:
         except:
             return False
     
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Report connection pool settings and known servers"""
+        if self.db_type != 'mongodb':
+            return {'db_type': self.db_type}
+        
+        pool_options = self.client.options.pool_options
+        servers = self.client.topology_description.server_descriptions()
+        return {
+            'db_type': self.db_type,
+            'max_pool_size': pool_options.max_pool_size,
+            'min_pool_size': pool_options.min_pool_size,
+            'max_idle_time_seconds': pool_options.max_idle_time_seconds,
+            'servers': [
+                {
+                    'address': f"{address[0]}:{address[1]}",
+                    'type': description.server_type_name,
+                    'round_trip_time_ms': round(description.round_trip_time * 1000, 2)
+                    if description.round_trip_time is not None else None
+                }
+                for address, description in servers.items()
+            ]
+        }
+    
     def close(self):
         """Close database connection"""
         if self.client:
@@ -115,29 +152,53 @@ class MongoCollection:
     def __init__(self, collection):
         self.collection = collection
     
-    def find_one(self, query: Dict) -> Optional[Dict]:
-        return self.collection.find_one(query)
+    def find_one(self, query: Dict, projection: Dict = None) -> Optional[Dict]:
+        return self.collection.find_one(query, projection)
     
-    def find(self, query: Dict = None, limit: int = None, skip: int = None) -> List[Dict]:
-        cursor = self.collection.find(query or {})
+    def find(self, query: Dict = None, limit: int = None, skip: int = None,
+             projection: Dict = None, sort: List = None) -> List[Dict]:
+        cursor = self.collection.find(query or {}, projection)
+        if sort:
+            cursor = cursor.sort(sort)
         if skip:
             cursor = cursor.skip(skip)
         if limit:
             cursor = cursor.limit(limit)
         return list(cursor)
     
+    def create_index(self, field: str, unique: bool = False):
+        return self.collection.create_index([(field, 1)], unique=unique)
+    
     def insert_one(self, document: Dict) -> str:
-        result = self.collection.insert_one(document)
+        with self._translate_duplicate_key():
+            result = self.collection.insert_one(document)
         return str(result.inserted_id)
     
     def replace_one(self, filter_query: Dict, replacement: Dict, upsert: bool = False) -> Dict:
-        result = self.collection.replace_one(filter_query, replacement, upsert=upsert)
+        with self._translate_duplicate_key():
+            result = self.collection.replace_one(filter_query, replacement, upsert=upsert)
         return {
             'matched_count': result.matched_count,
             'modified_count': result.modified_count,
             'upserted_id': str(result.upserted_id) if result.upserted_id else None
         }
     
+    def update_one(self, filter_query: Dict, update: Dict) -> Dict:
+        with self._translate_duplicate_key():
+            result = self.collection.update_one(filter_query, update)
+        return {
+            'matched_count': result.matched_count,
+            'modified_count': result.modified_count
+        }
+    
+    def find_one_and_update(self, filter_query: Dict, update: Dict) -> Optional[Dict]:
+        """Apply an update and return the document as it is after the update"""
+        from pymongo import ReturnDocument
+        with self._translate_duplicate_key():
+            return self.collection.find_one_and_update(
+                filter_query, update, return_document=ReturnDocument.AFTER
+            )
+    
     def delete_one(self, query: Dict) -> Dict:
         result = self.collection.delete_one(query)
         return {'deleted_count': result.deleted_count}
@@ -149,14 +210,33 @@ class MongoCollection:
     def count(self, query: Dict = None) -> int:
         """Count documents matching the query (alias for count_documents)"""
         return self.count_documents(query or {})
+    
+    @contextmanager
+    def _translate_duplicate_key(self):
+        """Re-raise pymongo's DuplicateKeyError as the adapter's DuplicateKeyError"""
+        from pymongo.errors import DuplicateKeyError as MongoDuplicateKeyError
+        try:
+            yield
+        except MongoDuplicateKeyError as e:
+            key_pattern = (e.details or {}).get('keyPattern') or (e.details or {}).get('keyValue') or {}
+            raise DuplicateKeyError(next(iter(key_pattern), None)) from e
 
 class TinyCollection:
     """TinyDB table wrapper to mimic MongoDB interface"""
     
+    # Unique fields per table; TinyDB has no indexes, so uniqueness is checked on write
+    _unique_fields = {}
+    
     def __init__(self, db, table_name: str):
         self.table = db.table(table_name)
+        self.table_name = table_name
     
-    def find_one(self, query: Dict) -> Optional[Dict]:
+    def create_index(self, field: str, unique: bool = False):
+        if unique:
+            self._unique_fields.setdefault(self.table_name, set()).add(field)
+        return f"{field}_1"
+    
+    def find_one(self, query: Dict, projection: Dict = None) -> Optional[Dict]:
         from tinydb import Query
         q = Query()
         
@@ -168,7 +248,7 @@ class TinyCollection:
                 doc = self.table.get(doc_id=doc_id)
                 if doc:
                     doc['_id'] = str(doc.doc_id)
-                return doc
+                return self._apply_projection(doc, projection)
             except:
                 return None
         
@@ -180,11 +260,14 @@ class TinyCollection:
             if result:
                 doc = result[0]
                 doc['_id'] = str(doc.doc_id)
-                return doc
+                return self._apply_projection(doc, projection)
         
         return None
     
-    def find(self, query: Dict = None, limit: int = None, skip: int = None) -> List[Dict]:
+    def find(self, query: Dict = None, limit: int = None, skip: int = None,
+             projection: Dict = None, sort: List = None) -> List[Dict]:
+        # TinyDB returns documents in insertion (doc_id) order, which is the
+        # only sort order supported here
         if not query:
             docs = self.table.all()
         else:
@@ -194,7 +277,9 @@ class TinyCollection:
             # Simple query support
             conditions = []
             for key, value in query.items():
-                if key != '_id':
+                if key == '$or':
+                    conditions.append(self._or_condition(q, value))
+                elif key != '_id':
                     conditions.append(q[key] == value)
             
             if conditions:
@@ -205,6 +290,12 @@ class TinyCollection:
             else:
                 docs = self.table.all()
         
+        # Support {'_id': {'$gt': ...}} for cursor-style pagination
+        id_filter = (query or {}).get('_id')
+        if isinstance(id_filter, dict) and '$gt' in id_filter:
+            after_id = self._convert_id(id_filter['$gt'])
+            docs = [doc for doc in docs if doc.doc_id > after_id]
+        
         # Add _id field and handle pagination
         for doc in docs:
             doc['_id'] = str(doc.doc_id)
@@ -214,6 +305,9 @@ class TinyCollection:
         if limit:
             docs = docs[:limit]
         
+        if projection:
+            docs = [self._apply_projection(doc, projection) for doc in docs]
+        
         return docs
     
     def insert_one(self, document: Dict) -> str:
@@ -223,6 +317,7 @@ class TinyCollection:
         
         # Convert datetime objects to ISO strings for TinyDB
         doc_copy = self._serialize_datetime(doc_copy)
+        self._check_unique(doc_copy)
         
         doc_id = self.table.insert(doc_copy)
         return str(doc_id)
@@ -235,6 +330,7 @@ class TinyCollection:
         
         if '_id' in filter_query:
             doc_id = self._convert_id(filter_query['_id'])
+            self._check_unique(replacement, exclude_doc_id=doc_id)
             try:
                 existing = self.table.get(doc_id=doc_id)
                 if existing:
@@ -266,14 +362,58 @@ class TinyCollection:
             existing_docs = self.table.search(condition)
             if existing_docs:
                 doc_ids = [doc.doc_id for doc in existing_docs[:1]]  # Replace only first match
+                self._check_unique(replacement, exclude_doc_id=doc_ids[0])
                 self.table.update(replacement, doc_ids=doc_ids)
                 return {'matched_count': 1, 'modified_count': 1, 'upserted_id': None}
             elif upsert:
+                self._check_unique(replacement)
                 new_id = self.table.insert(replacement)
                 return {'matched_count': 0, 'modified_count': 0, 'upserted_id': str(new_id)}
         
         return {'matched_count': 0, 'modified_count': 0, 'upserted_id': None}
     
+    def update_one(self, filter_query: Dict, update: Dict) -> Dict:
+        """Apply a MongoDB-style $set update to the first matching document"""
+        from tinydb import Query
+        
+        fields = self._serialize_datetime(update.get('$set', {}))
+        
+        if '_id' in filter_query:
+            doc_id = self._convert_id(filter_query['_id'])
+            self._check_unique(fields, exclude_doc_id=doc_id)
+            try:
+                if self.table.get(doc_id=doc_id):
+                    self.table.update(fields, doc_ids=[doc_id])
+                    return {'matched_count': 1, 'modified_count': 1}
+            except:
+                pass
+            return {'matched_count': 0, 'modified_count': 0}
+        
+        q = Query()
+        conditions = []
+        for key, value in filter_query.items():
+            conditions.append(q[key] == value)
+        
+        if conditions:
+            condition = conditions[0]
+            for cond in conditions[1:]:
+                condition = condition & cond
+            
+            docs = self.table.search(condition)
+            if docs:
+                self._check_unique(fields, exclude_doc_id=docs[0].doc_id)
+                self.table.update(fields, doc_ids=[docs[0].doc_id])
+                return {'matched_count': 1, 'modified_count': 1}
+        
+        return {'matched_count': 0, 'modified_count': 0}
+    
+    def find_one_and_update(self, filter_query: Dict, update: Dict) -> Optional[Dict]:
+        """Apply an update and return the document as it is after the update"""
+        result = self.update_one(filter_query, update)
+        if not result['matched_count']:
+            return None
+        return self.find_one(filter_query)
+    
     def delete_one(self, query: Dict) -> Dict:
         if '_id' in query:
             doc_id = self._convert_id(query['_id'])
@@ -356,6 +496,33 @@ class TinyCollection:
         """Count documents matching the query (alias for count_documents)"""
         return self.count_documents(query)
     
+    def _check_unique(self, document: Dict, exclude_doc_id=None):
+        """Raise DuplicateKeyError if another document already holds a unique value"""
+        from tinydb import Query
+        q = Query()
+        
+        for field in self._unique_fields.get(self.table_name, ()):
+            if field not in document:
+                continue
+            for doc in self.table.search(q[field] == document[field]):
+                if doc.doc_id != exclude_doc_id:
+                    raise DuplicateKeyError(field)
+    
+    def _or_condition(self, q, clauses):
+        """Build a TinyDB condition from a MongoDB-style $or of equality clauses"""
+        condition = None
+        for clause in clauses:
+            for key, value in clause.items():
+                cond = q[key] == value
+                condition = cond if condition is None else condition | cond
+        return condition
+    
+    def _apply_projection(self, doc, projection):
+        """Keep only the projected fields (plus _id) of a document"""
+        if not doc or not projection:
+            return doc
+        return {key: value for key, value in doc.items() if key == '_id' or projection.get(key)}
+    
     def _convert_id(self, id_value):
         """Convert string ID to int for TinyDB"""
         if isinstance(id_value, str):
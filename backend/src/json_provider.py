@@ -0,0 +1,41 @@
+"""
+JSON provider for Niche Compass
+Serializes API responses with orjson when it is installed
+"""
+
+from bson import ObjectId
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson's C serializer"""
+    
+    def dumps(self, obj, **kwargs):
+        # Datetimes go through default() so they are HTTP dates, as with the
+        # default provider, rather than orjson's ISO-8601
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, ObjectId):
+            return str(o)
+        return DefaultJSONProvider.default(o)
+
+def init_json_provider(app):
+    """Use orjson for JSON responses when available"""
+    if orjson is None:
+        app.logger.info("orjson not installed, using the default JSON provider")
+        return
+    app.json = ORJSONProvider(app)
@@ -1,6 +1,9 @@
 import os
 import sys
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 
@@ -10,6 +13,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 # Import configuration and database
 from src.config import Config
 from src.database import db_instance
+from src.database_adapter import db_adapter
+from src.models.user import User
 
 # Import all route blueprints
 from src.routes.user import user_bp
@@ -20,13 +25,20 @@ from src.routes.market_pulse import market_pulse_bp
 from src.routes.auth_routes import auth_bp
 
 # Import Auth0 validator
-from src.auth import init_auth0_validator
+from src.auth import init_auth0_validator, require_permission
+from src.json_provider import init_json_provider
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Configure logging; records are queued and written by a background thread
+# so request handlers never block on log I/O
+log_queue = queue.SimpleQueue()
+log_output_handler = logging.StreamHandler()
+log_output_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 )
+log_listener = QueueListener(log_queue, log_output_handler, respect_handler_level=True)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
 def create_app():
@@ -40,6 +52,9 @@ def create_app():
     app.config['AUTH0_CLIENT_ID'] = Config.AUTH0_CLIENT_ID
     app.config['AUTH0_CLIENT_SECRET'] = Config.AUTH0_CLIENT_SECRET
     
+    # Serialize JSON responses with orjson when available
+    init_json_provider(app)
+    
     # Initialize Auth0 validator
     init_auth0_validator(app)
     
@@ -48,6 +63,14 @@ def create_app():
          allow_headers=['Content-Type', 'Authorization'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'])
     
+    # Enforce unique user emails and usernames at the database level; if the
+    # indexes cannot be built, create_user's existence check is the only guard
+    try:
+        User.ensure_indexes()
+    except Exception as e:
+        logger.warning("Could not create user indexes, duplicate users are only "
+                       "rejected by the pre-insert check: %s", e)
+    
     # Register blueprints
     logger.info("Registering user_bp blueprint")
     app.register_blueprint(user_bp, url_prefix='/api')
@@ -83,6 +106,16 @@ def create_app():
             'version': '1.0.0'
         }
     
+    # Database connection pool metrics (exposes server addresses, admin only)
+    @app.route('/api/metrics', methods=['GET'])
+    @require_permission('read:metrics')
+    def metrics():
+        """Connection pool metrics endpoint"""
+        try:
+            return {'database_pool': db_adapter.get_pool_stats()}
+        except Exception as e:
+            return {'database_pool': {'error': str(e)}}, 500
+    
     # API info endpoint
     @app.route('/api', methods=['GET'])
     def api_info():
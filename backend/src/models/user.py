@@ -1,8 +1,23 @@
 from datetime import datetime
 from bson import ObjectId
+from flask import g, has_request_context
 from src.database import get_collection
 from src.config import Config
 
+def _request_user_cache():
+    """Get the per-request user cache stored on flask.g (None outside a request)"""
+    if not has_request_context():
+        return None
+    if '_user_cache' not in g:
+        g._user_cache = {}
+    return g._user_cache
+
+def _forget_cached_user(user_id):
+    """Drop a user from the per-request cache after it has been written"""
+    cache = _request_user_cache()
+    if cache is not None:
+        cache.pop(str(user_id), None)
+
 class User:
     def __init__(self, username, email, password_hash=None, subscription_tier='free',
                  tracked_keywords=None, favorite_niches=None, api_usage=None,
@@ -17,6 +32,8 @@ class User:
         self.api_usage = api_usage or {'requests_today': 0, 'last_reset': datetime.utcnow()}
         self.created_at = created_at or datetime.utcnow()
         self.updated_at = updated_at or datetime.utcnow()
+        # True when loaded with a projection; the missing fields hold defaults
+        self._partial = False
     
     def to_dict(self):
         """Convert to dictionary for JSON serialization"""
@@ -32,6 +49,15 @@ class User:
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
+    def to_summary_dict(self):
+        """Convert the fields loaded by find_page() to a dictionary"""
+        return {
+            '_id': str(self._id),
+            'username': self.username,
+            'email': self.email,
+            'subscription_tier': self.subscription_tier
+        }
+    
     @classmethod
     def from_dict(cls, data):
         """Create User instance from dictionary"""
@@ -50,6 +76,9 @@ class User:
     
     def save(self):
         """Save user to database"""
+        if self._partial:
+            raise RuntimeError("Cannot save() a partially loaded user; use _update_fields()")
+        
         collection = get_collection(Config.COLLECTION_USERS)
         if collection is None:
             return None
@@ -66,20 +95,111 @@ class User:
             data,
             upsert=True
         )
+        _forget_cached_user(self._id)
         return result
+
+    
+    def _update_fields(self, fields):
+        """Persist only the given fields with a $set update"""
+        collection = get_collection(Config.COLLECTION_USERS)
+        if collection is None:
+            return None
+        
+        self.updated_at = datetime.utcnow()
+        updates = dict(fields, updated_at=self.updated_at)
+        result = collection.update_one({'_id': self._id}, {'$set': updates})
+        _forget_cached_user(self._id)
+        return result
+    
+    @classmethod
+    def ensure_indexes(cls):
+        """Create the unique indexes that enforce one account per email and username"""
+        collection = get_collection(Config.COLLECTION_USERS)
+        if collection is None:
+            return
+        
+        collection.create_index('email', unique=True)
+        collection.create_index('username', unique=True)
     
     @classmethod
-    def find_by_id(cls, user_id):
-        """Find user by ID"""
+    def find_by_id(cls, user_id, projection=None):
+        """Find user by ID, memoized for the lifetime of the current request
+        
+        Pass a projection (e.g. {'tracked_keywords': 1}) to load only the fields
+        a caller needs; such partial users refuse save() and must be persisted
+        with _update_fields().
+        
+        Repeated lookups of the same user and projection in one request return
+        the same User instance, so callers share its state. No current route
+        looks a user up twice (require_permission does not load a User); the
+        memo is for request-scoped helpers that do.
+        """
+        cache = _request_user_cache()
+        if isinstance(projection, dict):
+            cache_key = tuple(sorted(projection.items()))
+        else:
+            cache_key = tuple(sorted(projection)) if projection else None
+        user_entries = cache.get(str(user_id), {}) if cache is not None else {}
+        if cache_key in user_entries:
+            return user_entries[cache_key]
+        
         collection = get_collection(Config.COLLECTION_USERS)
         if collection is None:
             return None
             
-        data = collection.find_one({'_id': ObjectId(user_id)})
+        data = collection.find_one({'_id': ObjectId(user_id)}, projection)
+        if data:
+            user = cls.from_dict(data)
+            user._partial = projection is not None
+            if cache is not None:
+                cache.setdefault(str(user_id), {})[cache_key] = user
+            return user
+        return None
+    
+    @classmethod
+    def patch(cls, user_id, updates):
+        """Set only the given fields on a user and return the updated user"""
+        collection = get_collection(Config.COLLECTION_USERS)
+        if collection is None:
+            return None
+        
+        updates = dict(updates, updated_at=datetime.utcnow())
+        data = collection.find_one_and_update(
+            {'_id': ObjectId(user_id)},
+            {'$set': updates}
+        )
+        _forget_cached_user(user_id)
+        
         if data:
             return cls.from_dict(data)
         return None
     
+    @classmethod
+    def find_page(cls, limit=50, after=None):
+        """Get a page of users ordered by ID, starting after the given user ID
+        
+        Only the summary fields are loaded, so use to_summary_dict() on the results;
+        like other partial users they refuse save().
+        """
+        collection = get_collection(Config.COLLECTION_USERS)
+        if collection is None:
+            return []
+        
+        query = {}
+        if after:
+            query['_id'] = {'$gt': ObjectId(after) if ObjectId.is_valid(after) else after}
+        
+        docs = collection.find(
+            query,
+            limit=limit,
+            projection={'username': 1, 'email': 1, 'subscription_tier': 1},
+            sort=[('_id', 1)]
+        )
+        users = [cls.from_dict(data) for data in docs]
+        for user in users:
+            user._partial = True
+        return users
+    
     @classmethod
     def find_by_email(cls, email):
         """Find user by email"""
@@ -104,29 +224,46 @@ class User:
             return cls.from_dict(data)
         return None
     
+    @classmethod
+    def find_by_email_or_username(cls, email=None, username=None):
+        """Find users matching either the email or the username in one query"""
+        collection = get_collection(Config.COLLECTION_USERS)
+        if collection is None:
+            return []
+        
+        clauses = []
+        if email:
+            clauses.append({'email': email.lower()})
+        if username:
+            clauses.append({'username': username})
+        if not clauses:
+            return []
+        
+        return [cls.from_dict(data) for data in collection.find({'$or': clauses}, limit=2)]
+    
     def add_tracked_keyword(self, keyword):
         """Add a keyword to user's tracking list"""
         if keyword not in self.tracked_keywords:
             self.tracked_keywords.append(keyword)
-            self.save()
+            self._update_fields({'tracked_keywords': self.tracked_keywords})
     
     def remove_tracked_keyword(self, keyword):
         """Remove a keyword from user's tracking list"""
         if keyword in self.tracked_keywords:
             self.tracked_keywords.remove(keyword)
-            self.save()
+            self._update_fields({'tracked_keywords': self.tracked_keywords})
     
     def add_favorite_niche(self, niche):
         """Add a niche to user's favorites"""
         if niche not in self.favorite_niches:
             self.favorite_niches.append(niche)
-            self.save()
+            self._update_fields({'favorite_niches': self.favorite_niches})
     
     def remove_favorite_niche(self, niche):
         """Remove a niche from user's favorites"""
         if niche in self.favorite_niches:
             self.favorite_niches.remove(niche)
-            self.save()
+            self._update_fields({'favorite_niches': self.favorite_niches})
     
     def increment_api_usage(self):
         """Increment API usage counter"""
@@ -155,6 +292,17 @@ class User:
         limit = limits.get(self.subscription_tier, 10)
         return self.api_usage.get('requests_today', 0) < limit
     
+    @classmethod
+    def delete_by_id(cls, user_id):
+        """Delete a user by ID without loading it first"""
+        collection = get_collection(Config.COLLECTION_USERS)
+        if collection is None:
+            return None
+        
+        result = collection.delete_one({'_id': ObjectId(user_id)})
+        _forget_cached_user(user_id)
+        return result
+    
     def delete(self):
         """Delete user from database"""
         collection = get_collection(Config.COLLECTION_USERS)
@@ -162,4 +310,5 @@ class User:
             return None
             
         result = collection.delete_one({'_id': self._id})
+        _forget_cached_user(self._id)
         return result
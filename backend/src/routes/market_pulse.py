@@ -83,10 +83,10 @@ def get_trending_niches():
         
         trending_results = []
         
-        # Analyze each trending keyword
-        for keyword in trending_keywords:
-            pulse_result = pulse_engine.get_market_pulse([keyword])
-            
+        # Analyze all trending keywords in one batch
+        pulse_results = pulse_engine.get_market_pulse_batch(trending_keywords)
+        
+        for keyword, pulse_result in pulse_results.items():
             if not pulse_result.get("error"):
                 # Extract key metrics
                 trending_data = {
@@ -232,10 +232,10 @@ def get_market_opportunities():
         
         opportunities = []
         
-        # Analyze each keyword for opportunities
-        for keyword in opportunity_keywords[:limit*2]:  # Analyze more to filter top ones
-            pulse_result = pulse_engine.get_market_pulse([keyword])
-            
+        # Analyze keywords for opportunities in one batch
+        pulse_results = pulse_engine.get_market_pulse_batch(opportunity_keywords[:limit*2])  # Analyze more to filter top ones
+        
+        for keyword, pulse_result in pulse_results.items():
             if not pulse_result.get("error"):
                 pulse_score = pulse_result.get("market_pulse_score", 0)
                 
@@ -299,9 +299,9 @@ def get_market_alerts():
         
         alerts = []
         
-        for keyword in alert_keywords:
-            pulse_result = pulse_engine.get_market_pulse([keyword])
-            
+        pulse_results = pulse_engine.get_market_pulse_batch(alert_keywords)
+        
+        for keyword, pulse_result in pulse_results.items():
             if not pulse_result.get("error"):
                 pulse_score = pulse_result.get("market_pulse_score", 0)
                 
@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
 from src.models.product import Product
-from src.services.azure_cognitive_services import analyze_image_from_url, analyze_sentiment
-from src.services.visual_intelligence import VisualIntelligenceEngine
+from src.services.azure_cognitive_services import (
+    analyze_product_media, invalidate_image_analysis
+)
+from src.auth import require_permission
+from src.services.visual_intelligence import get_engine as get_visual_intelligence_engine
 import re
 import logging
 
@@ -56,19 +59,19 @@ def analyze_product():
     }
 
     # --- Azure Cognitive Services + Visual Intelligence Integration ---
-    # Initialize Visual Intelligence Engine
-    vi_engine = VisualIntelligenceEngine()
+    # Shared Visual Intelligence Engine
+    vi_engine = get_visual_intelligence_engine()
+    
+    # Image and review analyses are independent Azure calls, so run them concurrently
+    images = mock_product_data.get("images") or []
+    reviews = mock_product_data.get("reviews") or []
+    image_analysis_results, sentiments = analyze_product_media(images, reviews)
     
     # Image Analysis with Visual Intelligence
-    if mock_product_data.get("images"):
-        image_analysis_results = []
+    if images:
         visual_intelligence_results = []
         
-        for img_url in mock_product_data["images"]:
-            # Basic Azure analysis
-            analysis = analyze_image_from_url(img_url)
-            image_analysis_results.append(analysis)
-            
+        for analysis in image_analysis_results:
             # Advanced Visual Intelligence analysis
             if not analysis.get("error"):
                 vi_analysis = vi_engine.analyze_visual_intelligence(analysis)
@@ -78,12 +81,11 @@ def analyze_product():
         mock_product_data["visual_intelligence"] = visual_intelligence_results
 
     # Sentiment Analysis for Reviews
-    if mock_product_data.get("reviews"):
-        sentiment_analysis_results = []
-        for review_text in mock_product_data["reviews"]:
-            sentiment = analyze_sentiment(review_text)
-            sentiment_analysis_results.append({"text": review_text, "sentiment": sentiment})
-        mock_product_data["review_sentiments"] = sentiment_analysis_results
+    if reviews:
+        mock_product_data["review_sentiments"] = [
+            {"text": review_text, "sentiment": sentiment}
+            for review_text, sentiment in zip(reviews, sentiments)
+        ]
     # --- End Azure Cognitive Services Integration ---
 
     # In a real application, you would save this analysis to Cosmos DB
@@ -92,6 +94,17 @@ def analyze_product():
 
     return jsonify({"product_analysis": mock_product_data}), 200
 
+@products_bp.route("/analyze/cache", methods=["DELETE"], strict_slashes=False)
+@require_permission("manage:cache")
+def invalidate_image_cache():
+    """Drop a cached image analysis so the next request re-analyzes the image"""
+    image_url = request.args.get("url", "").strip()
+    if not image_url:
+        return jsonify({"error": "Query parameter \"url\" is required"}), 400
+
+    invalidated = invalidate_image_analysis(image_url)
+    return jsonify({"url": image_url, "invalidated": invalidated}), 200
+
 @products_bp.route("/<product_id>", methods=["GET"])
 def get_product(product_id):
     # In a real application, you would fetch the product from Cosmos DB
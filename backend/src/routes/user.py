@@ -1,22 +1,38 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import User
+from bson import ObjectId
+from src.database_adapter import DuplicateKeyError, db_adapter
+from src.auth import require_permission
 import logging
 
 logger = logging.getLogger(__name__)
 user_bp = Blueprint('user', __name__)
 
 @user_bp.route('/users', methods=['GET'])
+@require_permission('read:users')
 def get_users():
-    """Get all users (for admin purposes)"""
+    """Get users page by page (for admin purposes)"""
     try:
-        # For MVP, we'll return a simple response
-        # In production, this would have proper pagination and admin authentication
+        limit = max(1, min(int(request.args.get('limit', 50)), 100))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    # A malformed cursor would compare against no _id and look like the last page
+    after = request.args.get('after', '').strip() or None
+    if after and not (ObjectId.is_valid(after) or (db_adapter.db_type == 'tinydb' and after.isdigit())):
+        return jsonify({'error': 'after must be a user ID'}), 400
+    
+    try:
+        users = User.find_page(limit, after)
+        results = [user.to_summary_dict() for user in users]
+        
         return jsonify({
-            'message': 'User management endpoint',
-            'note': 'This endpoint will be implemented with proper authentication'
+            'users': results,
+            'count': len(results),
+            'next_after': results[-1]['_id'] if len(results) == limit else None
         })
     except Exception as e:
-        logger.error(f"Error getting users: {str(e)}")
+        logger.error("Error getting users: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @user_bp.route('/users', methods=['POST'])
@@ -35,21 +51,28 @@ def create_user():
         username = data['username'].strip()
         email = data['email'].strip().lower()
         
-        # Check if user already exists
-        if User.find_by_email(email):
+        # Check if user already exists (email and username in a single query);
+        # this still protects collections where the unique indexes could not be built
+        existing_users = User.find_by_email_or_username(email, username)
+        if any(existing.email == email for existing in existing_users):
             return jsonify({'error': 'User with this email already exists'}), 409
         
-        if User.find_by_username(username):
+        if existing_users:
             return jsonify({'error': 'Username already taken'}), 409
         
-        # Create new user
+        # Create new user; the unique indexes reject a duplicate inserted concurrently
         user = User(
             username=username,
             email=email,
             subscription_tier=data.get('subscription_tier', 'free')
         )
         
-        result = user.save()
+        try:
+            result = user.save()
+        except DuplicateKeyError as e:
+            if e.field == 'email':
+                return jsonify({'error': 'User with this email already exists'}), 409
+            return jsonify({'error': 'Username already taken'}), 409
         if result:
             return jsonify({
                 'message': 'User created successfully',
@@ -59,7 +82,7 @@ def create_user():
             return jsonify({'error': 'Failed to create user'}), 500
         
     except Exception as e:
-        logger.error(f"Error creating user: {str(e)}")
+        logger.error("Error creating user: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @user_bp.route('/users/<user_id>', methods=['GET'])
@@ -75,77 +98,84 @@ def get_user(user_id):
         })
         
     except Exception as e:
-        logger.error(f"Error getting user: {str(e)}")
+        logger.error("Error getting user: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @user_bp.route('/users/<user_id>', methods=['PUT'])
 def update_user(user_id):
     """Update user information"""
     try:
-        user = User.find_by_id(user_id)
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-        
         data = request.get_json()
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        # Update allowed fields
-        if 'username' in data and data['username'].strip():
-            # Check if username is already taken by another user
-            existing_user = User.find_by_username(data['username'].strip())
-            if existing_user and str(existing_user._id) != user_id:
-                return jsonify({'error': 'Username already taken'}), 409
-            user.username = data['username'].strip()
-        
-        if 'email' in data and data['email'].strip():
-            # Check if email is already taken by another user
-            email = data['email'].strip().lower()
-            existing_user = User.find_by_email(email)
-            if existing_user and str(existing_user._id) != user_id:
-                return jsonify({'error': 'Email already taken'}), 409
-            user.email = email
+        # Collect only the fields that change
+        updates = {}
+        
+        username = data['username'].strip() if 'username' in data else ''
+        email = data['email'].strip().lower() if 'email' in data else ''
+        
+        # Check if username or email is already taken by another user
+        other_users = [
+            existing for existing in User.find_by_email_or_username(email, username)
+            if str(existing._id) != user_id
+        ]
+        if username and any(existing.username == username for existing in other_users):
+            return jsonify({'error': 'Username already taken'}), 409
+        
+        if other_users:
+            return jsonify({'error': 'Email already taken'}), 409
+        
+        if username:
+            updates['username'] = username
+        
+        if email:
+            updates['email'] = email
         
         if 'subscription_tier' in data:
             if data['subscription_tier'] in ['free', 'basic', 'premium']:
-                user.subscription_tier = data['subscription_tier']
+                updates['subscription_tier'] = data['subscription_tier']
         
-        result = user.save()
-        if result:
-            return jsonify({
-                'message': 'User updated successfully',
-                'user': user.to_dict()
-            })
-        else:
-            return jsonify({'error': 'Failed to update user'}), 500
+        try:
+            user = User.patch(user_id, updates)
+        except DuplicateKeyError as e:
+            if e.field == 'email':
+                return jsonify({'error': 'Email already taken'}), 409
+            return jsonify({'error': 'Username already taken'}), 409
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        return jsonify({
+            'message': 'User updated successfully',
+            'user': user.to_dict()
+        })
         
     except Exception as e:
-        logger.error(f"Error updating user: {str(e)}")
+        logger.error("Error updating user: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @user_bp.route('/users/<user_id>', methods=['DELETE'])
 def delete_user(user_id):
     """Delete user"""
     try:
-        user = User.find_by_id(user_id)
-        if not user:
+        result = User.delete_by_id(user_id)
+        if result is None:
+            return jsonify({'error': 'Failed to delete user'}), 500
+        
+        if result['deleted_count'] == 0:
             return jsonify({'error': 'User not found'}), 404
         
-        result = user.delete()
-        if result and result.deleted_count > 0:
-            return jsonify({'message': 'User deleted successfully'}), 200
-        else:
-            return jsonify({'error': 'Failed to delete user'}), 500
+        return jsonify({'message': 'User deleted successfully'}), 200
         
     except Exception as e:
-        logger.error(f"Error deleting user: {str(e)}")
+        logger.error("Error deleting user: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @user_bp.route('/users/<user_id>/keywords', methods=['POST'])
 def add_tracked_keyword(user_id):
     """Add a keyword to user's tracking list"""
     try:
-        user = User.find_by_id(user_id)
+        user = User.find_by_id(user_id, projection={'tracked_keywords': 1})
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -165,14 +195,14 @@ def add_tracked_keyword(user_id):
         })
         
     except Exception as e:
-        logger.error(f"Error adding tracked keyword: {str(e)}")
+        logger.error("Error adding tracked keyword: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @user_bp.route('/users/<user_id>/keywords/<keyword>', methods=['DELETE'])
 def remove_tracked_keyword(user_id, keyword):
     """Remove a keyword from user's tracking list"""
     try:
-        user = User.find_by_id(user_id)
+        user = User.find_by_id(user_id, projection={'tracked_keywords': 1})
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -184,14 +214,14 @@ def remove_tracked_keyword(user_id, keyword):
         })
         
     except Exception as e:
-        logger.error(f"Error removing tracked keyword: {str(e)}")
+        logger.error("Error removing tracked keyword: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @user_bp.route('/users/<user_id>/niches', methods=['POST'])
 def add_favorite_niche(user_id):
     """Add a niche to user's favorites"""
     try:
-        user = User.find_by_id(user_id)
+        user = User.find_by_id(user_id, projection={'favorite_niches': 1})
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -211,14 +241,14 @@ def add_favorite_niche(user_id):
         })
         
     except Exception as e:
-        logger.error(f"Error adding favorite niche: {str(e)}")
+        logger.error("Error adding favorite niche: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @user_bp.route('/users/<user_id>/niches/<niche>', methods=['DELETE'])
 def remove_favorite_niche(user_id, niche):
     """Remove a niche from user's favorites"""
     try:
-        user = User.find_by_id(user_id)
+        user = User.find_by_id(user_id, projection={'favorite_niches': 1})
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -230,5 +260,5 @@ def remove_favorite_niche(user_id, niche):
         })
         
     except Exception as e:
-        logger.error(f"Error removing favorite niche: {str(e)}")
+        logger.error("Error removing favorite niche: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
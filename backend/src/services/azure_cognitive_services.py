@@ -1,56 +1,127 @@
 import os
 import time
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
 # Get environment variables
 COG_SERV_KEY = os.getenv("AZURE_COGNITIVE_SERVICES_KEY")
 COG_SERV_ENDPOINT = os.getenv("AZURE_COGNITIVE_SERVICES_ENDPOINT")
 
-# Initialize clients only if credentials are available
-computervision_client = None
-text_analytics_client = None
+# Clients are created lazily on first use so importing this module stays cheap
+# (the Azure SDKs are only imported when credentials are configured)
+if not (COG_SERV_KEY and COG_SERV_ENDPOINT):
+    print("Azure Cognitive Services credentials not found. Running in mock mode.")
 
-if COG_SERV_KEY and COG_SERV_ENDPOINT:
+@functools.lru_cache(maxsize=None)
+def _computervision_client():
+    """Create the Computer Vision client once, or None when unavailable."""
+    if not (COG_SERV_KEY and COG_SERV_ENDPOINT):
+        return None
     try:
         from azure.cognitiveservices.vision.computervision import ComputerVisionClient
-        from azure.cognitiveservices.vision.computervision.models import OperationStatusCodes
-        from azure.cognitiveservices.vision.computervision.models import VisualFeatureTypes
         from msrest.authentication import CognitiveServicesCredentials
-        
-        from azure.core.credentials import AzureKeyCredential
-        from azure.ai.textanalytics import TextAnalyticsClient
-        
-        # Initialize Computer Vision client
-        computervision_client = ComputerVisionClient(
+
+        client = ComputerVisionClient(
             COG_SERV_ENDPOINT,
             CognitiveServicesCredentials(COG_SERV_KEY)
         )
-        
-        # Initialize Text Analytics client
-        text_analytics_client = TextAnalyticsClient(
+        print("Azure Computer Vision initialized successfully")
+        return client
+    except Exception as e:
+        print(f"Failed to initialize Azure Computer Vision: {e}")
+        return None
+
+@functools.lru_cache(maxsize=None)
+def _image_features():
+    """Visual features requested for every image analysis."""
+    from azure.cognitiveservices.vision.computervision.models import VisualFeatureTypes
+    return [VisualFeatureTypes.tags, VisualFeatureTypes.description, VisualFeatureTypes.categories]
+
+@functools.lru_cache(maxsize=None)
+def _text_analytics_client():
+    """Create the Text Analytics client once, or None when unavailable."""
+    if not (COG_SERV_KEY and COG_SERV_ENDPOINT):
+        return None
+    try:
+        from azure.core.credentials import AzureKeyCredential
+        from azure.ai.textanalytics import TextAnalyticsClient
+
+        client = TextAnalyticsClient(
             endpoint=COG_SERV_ENDPOINT,
             credential=AzureKeyCredential(COG_SERV_KEY)
         )
-        print("Azure Cognitive Services initialized successfully")
+        print("Azure Text Analytics initialized successfully")
+        return client
     except Exception as e:
-        print(f"Failed to initialize Azure Cognitive Services: {e}")
-        computervision_client = None
-        text_analytics_client = None
-else:
-    print("Azure Cognitive Services credentials not found. Running in mock mode.")
+        print(f"Failed to initialize Azure Text Analytics: {e}")
+        return None
+
+# LRU cache of analysis results; product images and reviews repeat heavily
+# across listings, and every real Azure call costs a round-trip and billing.
+# Entries expire after RESULT_CACHE_TTL_SECONDS. Cached results are shared
+# between callers and must be treated as read-only.
+RESULT_CACHE_SIZE = int(os.getenv("AZURE_RESULT_CACHE_SIZE", 50000))
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("AZURE_RESULT_CACHE_TTL", 86400))
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+def _cache_get(key):
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del _result_cache[key]
+            return None
+        _result_cache.move_to_end(key)
+        return result
+
+def _cache_put(key, result):
+    # Errors are transient, so only successful analyses are kept
+    if result.get("error"):
+        return
+    with _result_cache_lock:
+        _result_cache[key] = (time.monotonic() + RESULT_CACHE_TTL_SECONDS, result)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+def invalidate_image_analysis(image_url):
+    """Drop the cached analysis for an image URL. Returns True if one was cached."""
+    with _result_cache_lock:
+        return _result_cache.pop(_image_cache_key(image_url), None) is not None
+
+def _image_cache_key(image_url):
+    """Key on the full image URL, lowercasing only the case-insensitive scheme and host."""
+    parts = urlsplit(image_url)
+    return ("image", parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower()).geturl())
+
+def _sentiment_cache_key(text):
+    return ("sentiment", hashlib.sha1(text.encode("utf-8")).hexdigest())
 
 def analyze_image_from_url(image_url):
-    """Analyzes an image from a URL using Computer Vision."""
+    """Analyzes an image from a URL using Computer Vision, reusing cached results."""
+    key = _image_cache_key(image_url)
+    result = _cache_get(key)
+    if result is None:
+        result = _analyze_image_uncached(image_url)
+        _cache_put(key, result)
+    return result
+
+def _analyze_image_uncached(image_url):
+    computervision_client = _computervision_client()
     if not computervision_client:
         print("Azure Cognitive Services not initialized. Using AI simulator.")
         from .azure_ai_simulator import azure_simulator
         return azure_simulator.analyze_image_from_url(image_url)
 
     try:
-        from azure.cognitiveservices.vision.computervision.models import VisualFeatureTypes
-        # Select the visual feature(s) you want to analyze
-        features = [VisualFeatureTypes.tags, VisualFeatureTypes.description, VisualFeatureTypes.categories]
-        
-        image_analysis = computervision_client.analyze_image(image_url, features)
+        image_analysis = computervision_client.analyze_image(image_url, _image_features())
 
         return {
             "description": image_analysis.description.captions[0].text if image_analysis.description.captions else None,
@@ -62,7 +133,16 @@ def analyze_image_from_url(image_url):
         return {"error": str(e)}
 
 def analyze_sentiment(text):
-    """Analyzes the sentiment of a given text using Language Service."""
+    """Analyzes the sentiment of a given text using Language Service, reusing cached results."""
+    key = _sentiment_cache_key(text or "")
+    result = _cache_get(key)
+    if result is None:
+        result = _analyze_sentiment_uncached(text)
+        _cache_put(key, result)
+    return result
+
+def _analyze_sentiment_uncached(text):
+    text_analytics_client = _text_analytics_client()
     if not text_analytics_client:
         print("Azure Text Analytics not initialized. Using AI simulator.")
         from .azure_ai_simulator import azure_simulator
@@ -81,17 +161,78 @@ def analyze_sentiment(text):
     try:
         documents = [text]
         response = text_analytics_client.analyze_sentiment(documents=documents)[0]
-
-        return {
-            "sentiment": response.sentiment,
-            "positive_score": response.confidence_scores.positive,
-            "neutral_score": response.confidence_scores.neutral,
-            "negative_score": response.confidence_scores.negative
-        }
+        return _format_sentiment_response(response)
     except Exception as e:
         print(f"Error analyzing sentiment: {e}")
         return {"error": str(e)}
 
+def _format_sentiment_response(response):
+    """Convert a Text Analytics document result into the sentiment dict format."""
+    if getattr(response, "is_error", False):
+        return {"error": response.error.message}
+
+    return {
+        "sentiment": response.sentiment,
+        "positive_score": response.confidence_scores.positive,
+        "neutral_score": response.confidence_scores.neutral,
+        "negative_score": response.confidence_scores.negative
+    }
+
+# Maximum documents Text Analytics accepts in one sentiment request
+SENTIMENT_BATCH_SIZE = 10
+
+def analyze_sentiment_batch(texts):
+    """Analyzes several texts, sending uncached ones to Azure in batches of 10.
+
+    Returns one result per text, in the same order as the input.
+    """
+    results = [None] * len(texts)
+    pending = []
+    for index, text in enumerate(texts):
+        results[index] = _cache_get(_sentiment_cache_key(text or ""))
+        if results[index] is None:
+            pending.append(index)
+
+    text_analytics_client = _text_analytics_client()
+    if not text_analytics_client:
+        for index in pending:
+            results[index] = _analyze_sentiment_uncached(texts[index])
+            _cache_put(_sentiment_cache_key(texts[index] or ""), results[index])
+        return results
+
+    for start in range(0, len(pending), SENTIMENT_BATCH_SIZE):
+        chunk = pending[start:start + SENTIMENT_BATCH_SIZE]
+        try:
+            responses = text_analytics_client.analyze_sentiment(documents=[texts[index] for index in chunk])
+            chunk_results = [_format_sentiment_response(response) for response in responses]
+        except Exception as e:
+            print(f"Error analyzing sentiment batch: {e}")
+            chunk_results = [{"error": str(e)} for _ in chunk]
+
+        for index, result in zip(chunk, chunk_results):
+            results[index] = result
+            _cache_put(_sentiment_cache_key(texts[index] or ""), result)
+
+    return results
+
+# Worker threads used to overlap independent Azure round-trips within a request
+_azure_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AZURE_MAX_CONCURRENT_CALLS", 8)),
+    thread_name_prefix="azure-ai"
+)
+
+def analyze_product_media(image_urls, review_texts):
+    """Analyzes product images and review sentiment concurrently.
+
+    Returns (image_results, sentiment_results), each in input order.
+    """
+    image_futures = [_azure_executor.submit(analyze_image_from_url, url) for url in image_urls]
+    sentiment_future = _azure_executor.submit(analyze_sentiment_batch, review_texts) if review_texts else None
+
+    image_results = [future.result() for future in image_futures]
+    sentiment_results = sentiment_future.result() if sentiment_future else []
+    return image_results, sentiment_results
+
 # Export main functions for backend integration
 analyze_image = analyze_image_from_url  # Alias for backward compatibility
 
@@ -6,13 +6,224 @@ First-of-its-kind real-time market monitoring and trend detection system
 """
 
 import os
-import json
 import math
 import random
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Tuple, Optional
-from collections import defaultdict, Counter
-import hashlib
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Tuple, Optional, Sequence, Iterable, Callable, NamedTuple
+from collections import OrderedDict
+
+# Gathered source data is reused for repeated (keyword, timeframe) queries
+# for MARKET_DATA_CACHE_TTL seconds, e.g. dashboard refreshes. Analysis is
+# still re-run on every call so timestamps and derived fields stay fresh.
+MARKET_DATA_CACHE_SIZE = int(os.getenv("MARKET_PULSE_CACHE_SIZE", 2048))
+MARKET_DATA_CACHE_TTL = int(os.getenv("MARKET_PULSE_CACHE_TTL", 60))
+
+# Shared pool for querying the market data sources concurrently
+_source_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("MARKET_PULSE_SOURCE_WORKERS", 8)),
+    thread_name_prefix="market-pulse"
+)
+
+# Separate pool for gathering keywords of a batch in parallel; each gather
+# waits on _source_executor, so sharing one pool could deadlock
+PARALLEL_BATCHES = os.getenv("NICHE_COMPASS_PARALLEL", "1") != "0"
+_batch_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("MARKET_PULSE_BATCH_WORKERS", 4)),
+    thread_name_prefix="market-pulse-batch"
+)
+
+# (label, lag) pairs: velocity is measured between the latest data point and
+# the one `lag` positions back. Ordered by increasing lag.
+VELOCITY_WINDOWS = (("24h", 2), ("7d", 7), ("30d", 30))
+
+class CompetitionLevel(IntEnum):
+    """Competition levels, ordered from least to most crowded"""
+    UNTAPPED = 0
+    LOW_COMPETITION = 1
+    MODERATE_COMPETITION = 2
+    HIGH_COMPETITION = 3
+    OVERSATURATED = 4
+    
+    @property
+    def label(self) -> str:
+        """Name used in API responses, e.g. 'high_competition'"""
+        return COMPETITION_LEVEL_LABELS[self]
+
+COMPETITION_LEVEL_LABELS = tuple(level.name.lower() for level in CompetitionLevel)
+
+# Opportunity scoring lookup tables, indexed by CompetitionLevel
+BASE_OPPORTUNITY_SCORES = (9, 8, 6, 4, 2)
+TRAJECTORY_MODIFIERS = MappingProxyType({"exploding": -1.5, "growing": -0.5, "stable": 0})
+MATURITY_MODIFIERS = MappingProxyType({"mature": -0.5, "growing": 0.5, "emerging": 1})
+
+# Competitive advantages needed for success, indexed by CompetitionLevel
+REQUIRED_ADVANTAGES = (
+    (
+        "Market education",
+        "First-mover advantage",
+        "Category definition"
+    ),
+    (
+        "Basic quality",
+        "Market presence",
+        "Customer acquisition"
+    ),
+    (
+        "Good product quality",
+        "Competitive pricing",
+        "Basic SEO",
+        "Customer service"
+    ),
+    (
+        "Quality differentiation",
+        "Competitive pricing",
+        "Fast shipping",
+        "Customer reviews strategy",
+        "SEO optimization"
+    ),
+    (
+        "Unique value proposition",
+        "Premium branding",
+        "Exceptional customer service",
+        "Innovative product features",
+        "Strong social media presence"
+    )
+)
+
+# Demand surge patterns
+SURGE_PATTERNS = MappingProxyType({
+    "viral_trend": {"multiplier": 10, "duration": 7, "decay": 0.8},
+    "seasonal_peak": {"multiplier": 5, "duration": 30, "decay": 0.9},
+    "event_driven": {"multiplier": 8, "duration": 14, "decay": 0.7},
+    "influencer_boost": {"multiplier": 6, "duration": 10, "decay": 0.75},
+    "organic_growth": {"multiplier": 2, "duration": 90, "decay": 0.95}
+})
+DEFAULT_SURGE_PATTERN = {"multiplier": 1, "duration": 30, "decay": 0.9}
+
+# Entry timing recommendations; copied into each response
+ENTRY_TIMING_NOW = MappingProxyType({
+    "recommendation": "enter_now",
+    "urgency": "critical",
+    "message": "Enter within 24-48 hours to catch demand surge"
+})
+ENTRY_TIMING_VERY_SOON = MappingProxyType({
+    "recommendation": "enter_very_soon",
+    "urgency": "high",
+    "message": "Enter within 1 week to ride explosive growth"
+})
+ENTRY_TIMING_STRATEGIC = MappingProxyType({
+    "recommendation": "enter_strategically",
+    "urgency": "medium",
+    "message": "Plan strategic entry within 2-4 weeks"
+})
+
+# Risk levels as integer scores, with their labels indexed by score
+RISK_LOW, RISK_MEDIUM, RISK_HIGH = 1, 2, 3
+RISK_LEVELS = (None, "low", "medium", "high")
+HIGH_COMPETITION_LEVELS = frozenset(("oversaturated", "high_competition"))
+
+# Overall risk indexed by the sum of the competition, trend and timing
+# scores. It is the average of all four risk fields with overall itself
+# counted as low: above 2.5 is high, above 1.5 is medium.
+OVERALL_RISK_BY_TOTAL = tuple(
+    RISK_HIGH if (total + RISK_LOW) / 4 > 2.5 else RISK_MEDIUM if (total + RISK_LOW) / 4 > 1.5 else RISK_LOW
+    for total in range(3 * RISK_HIGH + 1)
+)
+
+class MarketRisks(NamedTuple):
+    """Risk scores for one niche, each RISK_LOW, RISK_MEDIUM or RISK_HIGH"""
+    competition: int
+    trend: int
+    timing: int
+    overall: int
+    
+    def to_dict(self) -> Dict[str, str]:
+        """Labelled form used in API responses"""
+        return {
+            "competition_risk": RISK_LEVELS[self.competition],
+            "trend_risk": RISK_LEVELS[self.trend],
+            "timing_risk": RISK_LEVELS[self.timing],
+            "overall_risk": RISK_LEVELS[self.overall]
+        }
+
+# Surge recommendations, in the order they are emitted
+SURGE_RECOMMENDATIONS = (
+    "🚀 URGENT: Massive demand surge detected - prioritize this niche!",
+    "⏰ CRITICAL TIMING: Enter market within 24-48 hours",
+    "📈 SUSTAINED OPPORTUNITY: Long-term potential detected",
+    "💰 PREMIUM PRICING: High demand supports premium positioning"
+)
+
+# Trajectory predictions indexed by the code returned from _score_trend
+TRAJECTORY_UNKNOWN = 0
+TRAJECTORY_PREDICTIONS = (
+    {"prediction": "unknown", "confidence": 0},
+    {"prediction": "explosive_growth", "confidence": 0.85, "timeframe": "1-2_weeks"},
+    {"prediction": "continued_growth", "confidence": 0.75, "timeframe": "2-4_weeks"},
+    {"prediction": "stable_trend", "confidence": 0.9, "timeframe": "4-8_weeks"},
+    {"prediction": "decline_ahead", "confidence": 0.7, "timeframe": "1-3_weeks"},
+    {"prediction": "uncertain", "confidence": 0.4, "timeframe": "unknown"}
+)
+
+def _make_threshold_classifier(thresholds: Iterable[Tuple[float, Any]], below: Any) -> Callable[[float], Any]:
+    """Build a classifier returning the label of the highest threshold <= value
+    
+    The sorted cutoffs and labels are bound into the closure, so each call
+    is a bisect with no attribute lookups. Values below every threshold
+    classify as `below`.
+    """
+    ordered = sorted(thresholds, key=lambda pair: pair[0])
+    cutoffs = tuple(threshold for threshold, _ in ordered)
+    labels = tuple(label for _, label in ordered)
+    
+    def classify(value: float) -> Any:
+        index = bisect_right(cutoffs, value) - 1
+        return labels[index] if index >= 0 else below
+    
+    return classify
+
+def _score_trend(velocity_values: Sequence[float], acceleration: float) -> Tuple[float, float, int]:
+    """Score trend velocities in a single pass.
+    
+    Returns (average_velocity, momentum_score, trajectory_code), where the
+    momentum score is clamped to 0-10 and the trajectory code indexes
+    TRAJECTORY_PREDICTIONS.
+    """
+    if not velocity_values:
+        return 0, 0, TRAJECTORY_UNKNOWN
+    
+    avg_velocity = sum(velocity_values) / len(velocity_values)
+    
+    # Momentum: base from average velocity (capped at 8), acceleration
+    # bonus (max +2) and a consistency bonus if all velocities are positive
+    base_score = min(avg_velocity * 2, 8)
+    acceleration_bonus = min(acceleration * 5, 2)
+    consistency_bonus = 1 if min(velocity_values) > 0 else 0
+    momentum_score = base_score + acceleration_bonus + consistency_bonus
+    momentum_score = 0 if momentum_score <= 0 else 10 if momentum_score > 10 else momentum_score
+    
+    # Trajectory pattern matching
+    if avg_velocity > 3 and acceleration > 0.5:
+        trajectory_code = 1
+    elif avg_velocity > 1.5 and acceleration > 0:
+        trajectory_code = 2
+    elif avg_velocity > 0.8 and abs(acceleration) < 0.2:
+        trajectory_code = 3
+    elif avg_velocity < 0.5 and acceleration < -0.3:
+        trajectory_code = 4
+    else:
+        trajectory_code = 5
+    
+    return avg_velocity, momentum_score, trajectory_code
 
 class TrendVelocityDetector:
     """Advanced trend velocity and momentum analysis"""
@@ -27,6 +238,11 @@ class TrendVelocityDetector:
             "falling": 0.2         # 20-50% decline
         }
         
+        self._classify_trend_velocity = _make_threshold_classifier(
+            ((threshold, status) for status, threshold in self.velocity_thresholds.items()),
+            below="falling"
+        )
+        
         self.trend_patterns = {
             "viral_spike": {"duration": 7, "peak_multiplier": 10, "decay_rate": 0.7},
             "seasonal_surge": {"duration": 30, "peak_multiplier": 3, "decay_rate": 0.9},
@@ -36,113 +252,62 @@ class TrendVelocityDetector:
     
     def calculate_trend_velocity(self, historical_data: List[Dict]) -> Dict[str, Any]:
         """Calculate trend velocity and momentum"""
+        return self.calculate_trend_velocity_from_values([point["value"] for point in historical_data])
+    
+    def calculate_trend_velocity_from_values(self, values: Sequence[float], now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Calculate trend velocity and momentum from a series of values, oldest first
+        
+        `now` anchors the peak date estimate; pass it when analyzing many
+        series together so they share one clock reading.
+        """
         
-        if len(historical_data) < 2:
+        if len(values) < 2:
             return {"velocity": 0, "status": "insufficient_data"}
         
-        # Calculate growth rates over different timeframes
+        # Calculate growth rates over different timeframes (24h, 7d, 30d),
+        # reading the current value once and each lagged point by index
         velocities = {}
-        
-        # 24-hour velocity
-        if len(historical_data) >= 2:
-            recent = historical_data[-1]["value"]
-            previous = historical_data[-2]["value"] 
-            velocities["24h"] = (recent - previous) / max(previous, 1) if previous > 0 else 0
-        
-        # 7-day velocity
-        if len(historical_data) >= 7:
-            week_ago = historical_data[-7]["value"]
-            current = historical_data[-1]["value"]
-            velocities["7d"] = (current - week_ago) / max(week_ago, 1) if week_ago > 0 else 0
-        
-        # 30-day velocity
-        if len(historical_data) >= 30:
-            month_ago = historical_data[-30]["value"] 
-            current = historical_data[-1]["value"]
-            velocities["30d"] = (current - month_ago) / max(month_ago, 1) if month_ago > 0 else 0
+        velocity_values = []
+        data_points = len(values)
+        current = values[-1]
+        
+        for window, lag in VELOCITY_WINDOWS:
+            if data_points < lag:
+                break
+            past = values[-lag]
+            velocity = (current - past) / max(past, 1) if past > 0 else 0
+            velocities[window] = velocity
+            velocity_values.append(velocity)
         
         # Calculate acceleration (rate of change of velocity)
         acceleration = 0
-        if len(velocities) >= 2:
-            velocity_values = list(velocities.values())
+        if len(velocity_values) >= 2:
             acceleration = (velocity_values[-1] - velocity_values[0]) / len(velocity_values)
         
-        # Determine overall trend status
-        avg_velocity = sum(velocities.values()) / len(velocities) if velocities else 0
+        # Score momentum and trajectory in one pass over the velocities
+        avg_velocity, momentum_score, trajectory_code = _score_trend(velocity_values, acceleration)
         trend_status = self._classify_trend_velocity(avg_velocity)
         
-        # Predict trend trajectory
-        trajectory = self._predict_trajectory(velocities, acceleration)
-        
         return {
             "velocities": velocities,
             "average_velocity": avg_velocity,
             "acceleration": acceleration,
             "trend_status": trend_status,
-            "momentum_score": self._calculate_momentum_score(velocities, acceleration),
-            "trajectory_prediction": trajectory,
-            "peak_estimation": self._estimate_peak(historical_data, velocities)
+            "momentum_score": momentum_score,
+            "trajectory_prediction": dict(TRAJECTORY_PREDICTIONS[trajectory_code]),
+            "peak_estimation": self._estimate_peak(current, avg_velocity, now)
         }
     
-    def _classify_trend_velocity(self, velocity: float) -> str:
-        """Classify trend based on velocity"""
-        for status, threshold in self.velocity_thresholds.items():
-            if velocity >= threshold:
-                return status
-        return "falling"
-    
-    def _calculate_momentum_score(self, velocities: Dict[str, float], acceleration: float) -> float:
-        """Calculate momentum score (0-10)"""
-        if not velocities:
-            return 0
-        
-        # Base score from average velocity
-        avg_velocity = sum(velocities.values()) / len(velocities)
-        base_score = min(avg_velocity * 2, 8)  # Cap base at 8
-        
-        # Acceleration bonus/penalty
-        acceleration_bonus = min(acceleration * 5, 2)  # Max +2 for positive acceleration
-        
-        # Consistency bonus (if all velocities are positive)
-        consistency_bonus = 1 if all(v > 0 for v in velocities.values()) else 0
-        
-        total_score = base_score + acceleration_bonus + consistency_bonus
-        return max(0, min(total_score, 10))  # Clamp between 0-10
-    
-    def _predict_trajectory(self, velocities: Dict[str, float], acceleration: float) -> Dict[str, Any]:
-        """Predict future trend trajectory"""
-        if not velocities:
-            return {"prediction": "unknown", "confidence": 0}
-        
-        avg_velocity = sum(velocities.values()) / len(velocities)
-        
-        # Pattern matching
-        if avg_velocity > 3 and acceleration > 0.5:
-            return {"prediction": "explosive_growth", "confidence": 0.85, "timeframe": "1-2_weeks"}
-        elif avg_velocity > 1.5 and acceleration > 0:
-            return {"prediction": "continued_growth", "confidence": 0.75, "timeframe": "2-4_weeks"}
-        elif avg_velocity > 0.8 and abs(acceleration) < 0.2:
-            return {"prediction": "stable_trend", "confidence": 0.9, "timeframe": "4-8_weeks"}
-        elif avg_velocity < 0.5 and acceleration < -0.3:
-            return {"prediction": "decline_ahead", "confidence": 0.7, "timeframe": "1-3_weeks"}
-        else:
-            return {"prediction": "uncertain", "confidence": 0.4, "timeframe": "unknown"}
-    
-    def _estimate_peak(self, historical_data: List[Dict], velocities: Dict[str, float]) -> Dict[str, Any]:
-        """Estimate when trend will peak"""
-        if not velocities or not historical_data:
-            return {"estimated_peak": None, "confidence": 0}
-        
-        current_value = historical_data[-1]["value"]
-        avg_velocity = sum(velocities.values()) / len(velocities)
-        
+    def _estimate_peak(self, current_value: float, avg_velocity: float, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Estimate when trend will peak from the already-averaged velocity"""
         if avg_velocity <= 0:
             return {"estimated_peak": "already_peaked", "confidence": 0.8}
         
         # Simple peak estimation based on velocity decay
         days_to_peak = max(7, int(30 / (avg_velocity + 0.1)))  # Slower for higher velocity
-        peak_date = datetime.now() + timedelta(days=days_to_peak)
-        peak_value = current_value * (1 + avg_velocity) ** (days_to_peak / 30)
+        peak_date = (now or datetime.now()) + timedelta(days=days_to_peak)
+        # (1 + v) ** t via exp/log1p; avg_velocity > 0 here so log1p is defined
+        peak_value = current_value * math.exp(math.log1p(avg_velocity) * days_to_peak / 30)
         
         return {
             "estimated_peak_date": peak_date.isoformat(),
@@ -162,6 +327,11 @@ class CompetitionDensityTracker:
             "low_competition": {"threshold": 300, "success_rate": 0.65},
             "untapped": {"threshold": 50, "success_rate": 0.85}
         }
+        
+        self._classify_competition_level = _make_threshold_classifier(
+            ((data["threshold"], CompetitionLevel[level.upper()]) for level, data in self.density_categories.items()),
+            below=CompetitionLevel.UNTAPPED
+        )
     
     def analyze_competition_density(self, niche_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze competition density and market saturation"""
@@ -193,7 +363,7 @@ class CompetitionDensityTracker:
         
         return {
             "density_score": density_score,
-            "competition_level": competition_level,
+            "competition_level": competition_level.label,
             "saturation_analysis": saturation_analysis,
             "growth_prediction": growth_prediction,
             "opportunity_score": opportunity_score,
@@ -216,14 +386,7 @@ class CompetitionDensityTracker:
         seller_concentration = min(listings_per_seller / 10, 0.5)  # Up to +0.5 for concentration
         
         total_density = base_density + velocity_factor + seller_concentration
-        return min(total_density, 10)
-    
-    def _classify_competition_level(self, total_listings: int) -> str:
-        """Classify competition level based on total listings"""
-        for level, data in self.density_categories.items():
-            if total_listings >= data["threshold"]:
-                return level
-        return "untapped"
+        return 10 if total_density > 10 else total_density
     
     def _analyze_market_saturation(self, total_listings: int, new_listings: int, top_seller_share: float) -> Dict[str, Any]:
         """Analyze market saturation indicators"""
@@ -266,34 +429,25 @@ class CompetitionDensityTracker:
             "entry_window": "closing_fast" if growth_rate > 0.8 else "narrowing" if growth_rate > 0.4 else "stable"
         }
     
-    def _calculate_opportunity_score(self, competition_level: str, saturation: Dict, growth_prediction: Dict) -> float:
+    def _calculate_opportunity_score(self, competition_level: CompetitionLevel, saturation: Dict, growth_prediction: Dict) -> float:
         """Calculate overall opportunity score (0-10)"""
         
         # Base score from competition level
-        base_scores = {
-            "oversaturated": 2,
-            "high_competition": 4,
-            "moderate_competition": 6,
-            "low_competition": 8,
-            "untapped": 9
-        }
-        base_score = base_scores.get(competition_level, 5)
+        base_score = BASE_OPPORTUNITY_SCORES[competition_level]
         
         # Saturation penalty
         saturation_penalty = saturation["saturation_percentage"] * 2  # Up to -2 points
         
         # Growth trajectory modifier
         trajectory = growth_prediction.get("competition_trajectory", "stable")
-        trajectory_modifiers = {"exploding": -1.5, "growing": -0.5, "stable": 0}
-        trajectory_modifier = trajectory_modifiers.get(trajectory, 0)
+        trajectory_modifier = TRAJECTORY_MODIFIERS.get(trajectory, 0)
         
         # Market maturity modifier
         maturity = saturation.get("market_maturity", "growing")
-        maturity_modifiers = {"mature": -0.5, "growing": 0.5, "emerging": 1}
-        maturity_modifier = maturity_modifiers.get(maturity, 0)
+        maturity_modifier = MATURITY_MODIFIERS.get(maturity, 0)
         
         final_score = base_score - saturation_penalty + trajectory_modifier + maturity_modifier
-        return max(0, min(final_score, 10))
+        return 0 if final_score <= 0 else 10 if final_score > 10 else final_score
     
     def _generate_entry_recommendation(self, opportunity_score: float) -> Dict[str, Any]:
         """Generate market entry recommendation"""
@@ -323,55 +477,24 @@ class CompetitionDensityTracker:
                 "reason": "Market oversaturated, wait for better timing"
             }
     
-    def _identify_required_advantages(self, competition_level: str) -> List[str]:
+    def _identify_required_advantages(self, competition_level: CompetitionLevel) -> List[str]:
         """Identify competitive advantages needed for success"""
         
-        advantage_requirements = {
-            "oversaturated": [
-                "Unique value proposition",
-                "Premium branding",
-                "Exceptional customer service",
-                "Innovative product features",
-                "Strong social media presence"
-            ],
-            "high_competition": [
-                "Quality differentiation", 
-                "Competitive pricing",
-                "Fast shipping",
-                "Customer reviews strategy",
-                "SEO optimization"
-            ],
-            "moderate_competition": [
-                "Good product quality",
-                "Competitive pricing", 
-                "Basic SEO",
-                "Customer service"
-            ],
-            "low_competition": [
-                "Basic quality",
-                "Market presence",
-                "Customer acquisition"
-            ],
-            "untapped": [
-                "Market education",
-                "First-mover advantage",
-                "Category definition"
-            ]
-        }
-        
-        return advantage_requirements.get(competition_level, [])
+        return list(REQUIRED_ADVANTAGES[competition_level])
 
 class DemandSurgeAnalyzer:
     """Detect and analyze demand surges and market opportunities"""
     
     def __init__(self):
-        self.surge_patterns = {
-            "viral_trend": {"multiplier": 10, "duration": 7, "decay": 0.8},
-            "seasonal_peak": {"multiplier": 5, "duration": 30, "decay": 0.9},
-            "event_driven": {"multiplier": 8, "duration": 14, "decay": 0.7},
-            "influencer_boost": {"multiplier": 6, "duration": 10, "decay": 0.75},
-            "organic_growth": {"multiplier": 2, "duration": 90, "decay": 0.95}
-        }
+        self.surge_patterns = SURGE_PATTERNS
+        
+        # The opportunity window depends only on the surge pattern (peak
+        # timing and sustainability come from the pattern table), so derive
+        # it once per pattern instead of on every detection
+        self._opportunity_windows = {}
+        for pattern in (*SURGE_PATTERNS, "no_significant_pattern"):
+            trajectory = self._predict_demand_trajectory(pattern, 0)
+            self._opportunity_windows[pattern] = self._calculate_opportunity_window(pattern, trajectory)
     
     def detect_demand_surge(self, demand_data: Dict[str, Any]) -> Dict[str, Any]:
         """Detect and analyze demand surges"""
@@ -392,8 +515,8 @@ class DemandSurgeAnalyzer:
         # Predict demand trajectory
         demand_trajectory = self._predict_demand_trajectory(surge_pattern, surge_magnitude)
         
-        # Calculate opportunity window
-        opportunity_window = self._calculate_opportunity_window(surge_pattern, demand_trajectory)
+        # Look up the opportunity window for this pattern
+        opportunity_window = dict(self._opportunity_windows[surge_pattern])
         
         return {
             "surge_detected": surge_magnitude > 1.5,
@@ -429,7 +552,7 @@ class DemandSurgeAnalyzer:
     def _predict_demand_trajectory(self, pattern: str, magnitude: float) -> Dict[str, Any]:
         """Predict how demand will evolve"""
         
-        pattern_data = self.surge_patterns.get(pattern, {"multiplier": 1, "duration": 30, "decay": 0.9})
+        pattern_data = self.surge_patterns.get(pattern, DEFAULT_SURGE_PATTERN)
         
         # Predict peak timing
         days_to_peak = max(1, int(pattern_data["duration"] * 0.3))  # Peak at 30% of duration
@@ -474,20 +597,14 @@ class DemandSurgeAnalyzer:
     def _generate_action_recommendations(self, magnitude: float, window: Dict) -> List[str]:
         """Generate specific action recommendations"""
         
-        recommendations = []
+        conditions = (
+            magnitude > 5,
+            window.get("urgency_level") == "critical",
+            window.get("window_duration", 0) > 20,
+            magnitude > 3
+        )
+        recommendations = [message for message, applies in zip(SURGE_RECOMMENDATIONS, conditions) if applies]
         
-        if magnitude > 5:
-            recommendations.append("🚀 URGENT: Massive demand surge detected - prioritize this niche!")
-            
-        if window.get("urgency_level") == "critical":
-            recommendations.append("⏰ CRITICAL TIMING: Enter market within 24-48 hours")
-            
-        if window.get("window_duration", 0) > 20:
-            recommendations.append("📈 SUSTAINED OPPORTUNITY: Long-term potential detected")
-            
-        if magnitude > 3:
-            recommendations.append("💰 PREMIUM PRICING: High demand supports premium positioning")
-            
         recommendations.append(f"🎯 OPTIMAL WINDOW: Enter in {window.get('optimal_entry_days', 'N/A')} days")
         
         return recommendations
@@ -500,13 +617,22 @@ class MarketPulseEngine:
         self.competition_tracker = CompetitionDensityTracker()
         self.demand_analyzer = DemandSurgeAnalyzer()
         
-        # Simulated real-time data sources (in production, connect to real APIs)
+        # Simulated real-time data sources (in production, connect to real APIs),
+        # sharing one random generator owned by the engine
+        self._rng = random.Random()
         self.data_sources = {
-            "etsy_trends": EtsyTrendsSimulator(),
-            "google_trends": GoogleTrendsSimulator(), 
-            "social_media": SocialMediaSimulator(),
-            "market_data": MarketDataSimulator()
+            "etsy_trends": EtsyTrendsSimulator(self._rng),
+            "google_trends": GoogleTrendsSimulator(self._rng),
+            "social_media": SocialMediaSimulator(self._rng),
+            "market_data": MarketDataSimulator(self._rng)
         }
+        
+        self._market_data_cache = OrderedDict()
+        self._market_data_cache_lock = threading.Lock()
+        
+        # Render today's trend dates up front so the first request served
+        # by this engine does not pay for it
+        _trend_dates()
     
     def get_market_pulse(self, niche_keywords: List[str], timeframe: str = "24h") -> Dict[str, Any]:
         """Get comprehensive real-time market pulse"""
@@ -514,34 +640,7 @@ class MarketPulseEngine:
         try:
             # Gather data from all sources
             market_data = self._gather_market_data(niche_keywords, timeframe)
-            
-            # Run all analysis engines
-            trend_analysis = self.trend_detector.calculate_trend_velocity(market_data["historical_data"])
-            competition_analysis = self.competition_tracker.analyze_competition_density(market_data["competition_data"])
-            demand_analysis = self.demand_analyzer.detect_demand_surge(market_data["demand_data"])
-            
-            # Calculate overall market pulse score
-            pulse_score = self._calculate_pulse_score(trend_analysis, competition_analysis, demand_analysis)
-            
-            # Generate market insights
-            insights = self._generate_market_insights(trend_analysis, competition_analysis, demand_analysis)
-            
-            # Create actionable recommendations
-            recommendations = self._create_action_plan(pulse_score, trend_analysis, competition_analysis, demand_analysis)
-            
-            return {
-                "market_pulse_score": pulse_score,
-                "pulse_status": self._classify_pulse_status(pulse_score),
-                "trend_analysis": trend_analysis,
-                "competition_analysis": competition_analysis,
-                "demand_analysis": demand_analysis,
-                "market_insights": insights,
-                "action_recommendations": recommendations,
-                "optimal_timing": self._calculate_optimal_timing(trend_analysis, demand_analysis),
-                "risk_assessment": self._assess_market_risks(competition_analysis, trend_analysis),
-                "timestamp": datetime.now().isoformat(),
-                "data_freshness": "real_time"
-            }
+            return self._analyze_market_data(market_data, datetime.now())
             
         except Exception as e:
             return {
@@ -549,19 +648,119 @@ class MarketPulseEngine:
                 "timestamp": datetime.now().isoformat()
             }
     
+    def get_market_pulse_batch(self, keywords: List[str], timeframe: str = "24h") -> Dict[str, Dict[str, Any]]:
+        """Get market pulse for many niches at once, keyed by keyword
+        
+        Each keyword is analyzed as its own niche, equivalent to calling
+        get_market_pulse([keyword]), but the analyzers are resolved once and
+        every result shares a single clock reading. Keywords are independent,
+        so their source data is gathered concurrently unless
+        NICHE_COMPASS_PARALLEL=0.
+        """
+        
+        gather = self._gather_market_data
+        analyze = self._analyze_market_data
+        now = datetime.now()
+        timestamp = now.isoformat()
+        results = {}
+        
+        if PARALLEL_BATCHES and len(keywords) > 1:
+            pending = [(keyword, _batch_executor.submit(gather, [keyword], timeframe)) for keyword in keywords]
+        else:
+            pending = [(keyword, None) for keyword in keywords]
+        
+        for keyword, future in pending:
+            try:
+                market_data = future.result() if future else gather([keyword], timeframe)
+                results[keyword] = analyze(market_data, now, timestamp)
+            except Exception as e:
+                results[keyword] = {
+                    "error": f"Market pulse analysis failed: {str(e)}",
+                    "timestamp": timestamp
+                }
+        
+        return results
+    
+    def _analyze_market_data(self, market_data: Dict[str, Any], now: datetime,
+                             timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Run all analysis engines over gathered market data as of `now`"""
+        
+        trend_analysis = self.trend_detector.calculate_trend_velocity_from_values(market_data["trend_values"], now)
+        competition_analysis = self.competition_tracker.analyze_competition_density(market_data["competition_data"])
+        demand_analysis = self.demand_analyzer.detect_demand_surge(market_data["demand_data"])
+        
+        # Calculate overall market pulse score
+        pulse_score = self._calculate_pulse_score(trend_analysis, competition_analysis, demand_analysis)
+        
+        # Generate market insights
+        insights = self._generate_market_insights(trend_analysis, competition_analysis, demand_analysis)
+        
+        # Timing feeds both the action plan and the response
+        optimal_timing = self._calculate_optimal_timing(trend_analysis, demand_analysis)
+        
+        # Create actionable recommendations
+        recommendations = self._create_action_plan(pulse_score, competition_analysis, demand_analysis, optimal_timing)
+        
+        return {
+            "market_pulse_score": pulse_score,
+            "pulse_status": self._classify_pulse_status(pulse_score),
+            "trend_analysis": trend_analysis,
+            "competition_analysis": competition_analysis,
+            "demand_analysis": demand_analysis,
+            "market_insights": insights,
+            "action_recommendations": recommendations,
+            "optimal_timing": optimal_timing,
+            "risk_assessment": self._assess_market_risks(competition_analysis, trend_analysis).to_dict(),
+            "timestamp": timestamp or now.isoformat(),
+            "data_freshness": "real_time"
+        }
+    
     def _gather_market_data(self, keywords: List[str], timeframe: str) -> Dict[str, Any]:
-        """Gather data from all market sources"""
+        """Gather data from all market sources, reusing recent results"""
+        
+        primary_keyword = keywords[0] if keywords else "handmade"
+        key = (primary_keyword, timeframe)
+        
+        with self._market_data_cache_lock:
+            entry = self._market_data_cache.get(key)
+            if entry is not None:
+                expires_at, market_data = entry
+                if expires_at > time.monotonic():
+                    self._market_data_cache.move_to_end(key)
+                    return market_data
+                del self._market_data_cache[key]
+        
+        market_data = self._fetch_market_data(primary_keyword, timeframe)
+        
+        with self._market_data_cache_lock:
+            self._market_data_cache[key] = (time.monotonic() + MARKET_DATA_CACHE_TTL, market_data)
+            self._market_data_cache.move_to_end(key)
+            while len(self._market_data_cache) > MARKET_DATA_CACHE_SIZE:
+                self._market_data_cache.popitem(last=False)
+        
+        return market_data
+    
+    def _fetch_market_data(self, primary_keyword: str, timeframe: str) -> Dict[str, Any]:
+        """Fetch fresh data for a keyword from all market sources"""
         
         # Simulate gathering data from multiple sources
-        # In production, this would connect to real APIs
+        # In production, these are independent API calls, so they are issued
+        # concurrently and the wall time is that of the slowest source
         
-        primary_keyword = keywords[0] if keywords else "handmade"
+        etsy = self.data_sources["etsy_trends"]
+        trend_future = _source_executor.submit(etsy.get_trend_series, primary_keyword, timeframe)
+        competition_future = _source_executor.submit(etsy.get_competition_data, primary_keyword)
+        demand_future = _source_executor.submit(self.data_sources["google_trends"].get_search_data, primary_keyword)
+        social_future = _source_executor.submit(self.data_sources["social_media"].get_social_buzz, primary_keyword)
+        
+        trend_series = trend_future.result()
         
         return {
-            "historical_data": self.data_sources["etsy_trends"].get_trend_data(primary_keyword, timeframe),
-            "competition_data": self.data_sources["etsy_trends"].get_competition_data(primary_keyword),
-            "demand_data": self.data_sources["google_trends"].get_search_data(primary_keyword),
-            "social_data": self.data_sources["social_media"].get_social_buzz(primary_keyword)
+            "trend_dates": trend_series["dates"],
+            "trend_values": trend_series["values"],
+            "competition_data": competition_future.result(),
+            "demand_data": demand_future.result(),
+            "social_data": social_future.result()
         }
     
     def _calculate_pulse_score(self, trend: Dict, competition: Dict, demand: Dict) -> float:
@@ -573,7 +772,7 @@ class MarketPulseEngine:
         demand_score = min(demand.get("surge_magnitude", 1) * 3, 10) * 0.3  # 30% weight
         
         total_score = trend_score + competition_score + demand_score
-        return min(total_score, 10)
+        return 10 if total_score > 10 else total_score
     
     def _classify_pulse_status(self, pulse_score: float) -> str:
         """Classify market pulse status"""
@@ -591,17 +790,20 @@ class MarketPulseEngine:
     def _generate_market_insights(self, trend: Dict, competition: Dict, demand: Dict) -> Dict[str, Any]:
         """Generate comprehensive market insights"""
         
+        momentum_score = trend.get("momentum_score", 0)
+        surge_magnitude = demand.get("surge_magnitude", 1)
+        
         insights = {
-            "market_temperature": "hot" if trend.get("momentum_score", 0) > 7 else "warm" if trend.get("momentum_score", 0) > 4 else "cool",
+            "market_temperature": "hot" if momentum_score > 7 else "warm" if momentum_score > 4 else "cool",
             "competition_pressure": competition.get("competition_level", "moderate"),
-            "demand_status": "surging" if demand.get("surge_magnitude", 1) > 2 else "stable",
+            "demand_status": "surging" if surge_magnitude > 2 else "stable",
             "market_maturity": competition.get("saturation_analysis", {}).get("market_maturity", "growing"),
             "trend_sustainability": trend.get("trajectory_prediction", {}).get("prediction", "uncertain"),
             "key_drivers": []
         }
         
         # Identify key market drivers
-        if demand.get("surge_magnitude", 1) > 3:
+        if surge_magnitude > 3:
             insights["key_drivers"].append("Strong demand surge detected")
             
         if competition.get("opportunity_score", 5) > 7:
@@ -612,7 +814,7 @@ class MarketPulseEngine:
         
         return insights
     
-    def _create_action_plan(self, pulse_score: float, trend: Dict, competition: Dict, demand: Dict) -> List[str]:
+    def _create_action_plan(self, pulse_score: float, competition: Dict, demand: Dict, optimal_timing: Dict) -> List[str]:
         """Create actionable recommendations"""
         
         recommendations = []
@@ -639,7 +841,6 @@ class MarketPulseEngine:
             recommendations.append("🚀 MARKET ENTRY: Enter immediately before competition increases")
             
         # Timing recommendations
-        optimal_timing = self._calculate_optimal_timing(trend, demand)
         if optimal_timing.get("urgency") == "critical":
             recommendations.append(f"⏰ CRITICAL TIMING: {optimal_timing.get('message', '')}")
         
@@ -648,132 +849,170 @@ class MarketPulseEngine:
     def _calculate_optimal_timing(self, trend: Dict, demand: Dict) -> Dict[str, Any]:
         """Calculate optimal market entry timing"""
         
-        trend_prediction = trend.get("trajectory_prediction", {})
-        demand_window = demand.get("opportunity_window", {})
-        
-        # Find the optimal window
-        trend_timeframe = trend_prediction.get("timeframe", "unknown")
-        demand_urgency = demand_window.get("urgency_level", "medium")
-        
-        if demand_urgency == "critical":
-            return {
-                "recommendation": "enter_now",
-                "urgency": "critical", 
-                "message": "Enter within 24-48 hours to catch demand surge"
-            }
-        elif trend_prediction.get("prediction") == "explosive_growth":
-            return {
-                "recommendation": "enter_very_soon",
-                "urgency": "high",
-                "message": "Enter within 1 week to ride explosive growth"
-            }
+        # Critical demand urgency wins, then explosive trend growth
+        if demand.get("opportunity_window", {}).get("urgency_level", "medium") == "critical":
+            timing = ENTRY_TIMING_NOW
+        elif trend.get("trajectory_prediction", {}).get("prediction") == "explosive_growth":
+            timing = ENTRY_TIMING_VERY_SOON
         else:
-            return {
-                "recommendation": "enter_strategically", 
-                "urgency": "medium",
-                "message": "Plan strategic entry within 2-4 weeks"
-            }
-    
-    def _assess_market_risks(self, competition: Dict, trend: Dict) -> Dict[str, Any]:
-        """Assess market entry risks"""
+            timing = ENTRY_TIMING_STRATEGIC
         
-        risks = {
-            "competition_risk": "low",
-            "trend_risk": "low", 
-            "timing_risk": "low",
-            "overall_risk": "low"
-        }
+        return dict(timing)
+    
+    def _assess_market_risks(self, competition: Dict, trend: Dict) -> MarketRisks:
+        """Assess market entry risks as integer risk scores"""
         
         # Competition risks
-        if competition.get("competition_level") in ["oversaturated", "high_competition"]:
-            risks["competition_risk"] = "high"
-            
+        competition_risk = RISK_HIGH if competition.get("competition_level") in HIGH_COMPETITION_LEVELS else RISK_LOW
+        
         # Trend sustainability risks
-        if trend.get("trajectory_prediction", {}).get("prediction") == "decline_ahead":
-            risks["trend_risk"] = "high"
-            
-        # Calculate overall risk
-        risk_scores = {"low": 1, "medium": 2, "high": 3}
-        avg_risk = sum(risk_scores.get(risk, 1) for risk in risks.values()) / len(risks)
-        
-        if avg_risk > 2.5:
-            risks["overall_risk"] = "high"
-        elif avg_risk > 1.5:
-            risks["overall_risk"] = "medium"
-            
-        return risks
+        trend_risk = RISK_HIGH if trend.get("trajectory_prediction", {}).get("prediction") == "decline_ahead" else RISK_LOW
+        
+        timing_risk = RISK_LOW
+        
+        # Overall risk from the precomputed table of score totals
+        overall_risk = OVERALL_RISK_BY_TOTAL[competition_risk + trend_risk + timing_risk]
+        
+        return MarketRisks(competition_risk, trend_risk, timing_risk, overall_risk)
 
 # Simulated data sources (replace with real APIs in production)
+
+# Per-day shape of the simulated 30-day trend, independent of keyword:
+# sine wave pattern folded together with a slight upward trend
+TREND_DAYS = 30
+TREND_SHAPE = tuple((math.sin(i * 0.2) * 0.3 + 1) * (1 + (i * 0.02)) for i in range(TREND_DAYS))
+
+def _simulate_trend_values(base_value: int, draw: Callable[[], float] = random.random) -> List[int]:
+    """Simulate 30 days of trend values: sine wave x noise x upward trend
+    
+    Noise is uniform in [0.8, 1.2), drawn inline from `draw` rather than
+    through random.uniform to skip a Python-level call per day.
+    """
+    return [int(base_value * shape * (0.8 + (1.2 - 0.8) * draw())) for shape in TREND_SHAPE]
+
+# (day, dates) for the most recently rendered simulated trend window
+_trend_dates_cache = (None, ())
+
+def _trend_dates() -> Tuple[str, ...]:
+    """ISO timestamps (midnight) of the 30 simulated days before today
+    
+    Rendered once per calendar day and shared by every keyword.
+    """
+    global _trend_dates_cache
+    today = date.today()
+    cached_day, dates = _trend_dates_cache
+    if cached_day != today:
+        midnight = datetime.combine(today, datetime.min.time())
+        dates = tuple((midnight - timedelta(days=TREND_DAYS - i)).isoformat() for i in range(TREND_DAYS))
+        _trend_dates_cache = (today, dates)
+    return dates
+
+@lru_cache(maxsize=4096)
+def _keyword_baselines(keyword: str) -> Tuple[int, int, int, int, int]:
+    """Keyword-derived baselines shared by all simulators
+    
+    Returns (trend_base, listing_base, search_base, social_mentions,
+    market_size), hashing the keyword once instead of once per simulator.
+    CRC-32 is used rather than hash(), which is salted per process, so the
+    baselines for a keyword are the same across workers and restarts.
+    """
+    keyword_hash = zlib.crc32(keyword.encode("utf-8"))
+    return (
+        keyword_hash % 1000 + 500,
+        keyword_hash % 5000 + 200,
+        keyword_hash % 1000 + 100,
+        keyword_hash % 2000 + 100,
+        keyword_hash % 100000 + 10000
+    )
+
 class EtsyTrendsSimulator:
     """Simulate Etsy trends data"""
     
+    def __init__(self, rng: Optional[random.Random] = None):
+        # Uniform draws are computed inline as a + (b - a) * draw()
+        self._draw = (rng or random).random
+    
     def get_trend_data(self, keyword: str, timeframe: str) -> List[Dict]:
-        """Simulate historical trend data"""
-        base_value = hash(keyword) % 1000 + 500
-        data = []
-        
-        for i in range(30):  # 30 days of data
-            # Simulate realistic trend patterns
-            day_factor = math.sin(i * 0.2) * 0.3 + 1  # Sine wave pattern
-            noise = random.uniform(0.8, 1.2)  # Random noise
-            trend_factor = 1 + (i * 0.02)  # Slight upward trend
-            
-            value = int(base_value * day_factor * noise * trend_factor)
-            
-            data.append({
-                "date": (datetime.now() - timedelta(days=30-i)).isoformat(),
-                "value": value
-            })
+        """Simulate historical trend data as a list of {"date", "value"} points"""
+        series = self.get_trend_series(keyword, timeframe)
         
-        return data
+        return [
+            {"date": day, "value": int(value)}
+            for day, value in zip(series["dates"], series["values"])
+        ]
+    
+    def get_trend_series(self, keyword: str, timeframe: str) -> Dict[str, Sequence]:
+        """Simulate historical trend data as parallel "dates" and "values" sequences
+        
+        Values are a packed float32 array, exact for integer counts below 2**24.
+        """
+        return {
+            "dates": _trend_dates(),
+            "values": array("f", _simulate_trend_values(_keyword_baselines(keyword)[0], self._draw))
+        }
     
     def get_competition_data(self, keyword: str) -> Dict[str, Any]:
         """Simulate competition data"""
-        base_listings = hash(keyword) % 5000 + 200
+        base_listings = _keyword_baselines(keyword)[1]
+        draw = self._draw
         
         return {
             "total_listings": base_listings,
             "active_sellers": base_listings // 3,
-            "new_listings_24h": random.randint(5, 50),
-            "top_10_market_share": random.uniform(0.2, 0.6),
-            "new_sellers_trend": random.uniform(0.05, 0.3)
+            "new_listings_24h": 5 + int(46 * draw()),  # 5-50 inclusive
+            "top_10_market_share": 0.2 + (0.6 - 0.2) * draw(),
+            "new_sellers_trend": 0.05 + (0.3 - 0.05) * draw()
         }
 
 class GoogleTrendsSimulator:
     """Simulate Google Trends data"""
     
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._draw = (rng or random).random
+    
     def get_search_data(self, keyword: str) -> Dict[str, Any]:
         """Simulate search trend data"""
-        baseline = hash(keyword) % 1000 + 100
-        current = baseline * random.uniform(1.2, 4.0)  # Simulate surge
+        baseline = _keyword_baselines(keyword)[2]
+        draw = self._draw
+        current = baseline * (1.2 + (4.0 - 1.2) * draw())  # Simulate surge
         
         return {
             "current_searches_24h": int(current),
             "baseline_searches": baseline,
-            "search_growth_7d": random.uniform(0.1, 0.8),
+            "search_growth_7d": 0.1 + (0.8 - 0.1) * draw(),
             "related_trends": [f"{keyword}_variant_{i}" for i in range(3)]
         }
 
 class SocialMediaSimulator:
     """Simulate social media buzz"""
     
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._draw = (rng or random).random
+    
     def get_social_buzz(self, keyword: str) -> Dict[str, Any]:
         """Simulate social media mentions"""
+        draw = self._draw
         return {
-            "social_mentions": hash(keyword) % 2000 + 100,
-            "sentiment_score": random.uniform(0.6, 0.9),
-            "viral_potential": random.uniform(0.3, 0.8)
+            "social_mentions": _keyword_baselines(keyword)[3],
+            "sentiment_score": 0.6 + (0.9 - 0.6) * draw(),
+            "viral_potential": 0.3 + (0.8 - 0.3) * draw()
         }
 
+SEASONALITY_LEVELS = ("high", "medium", "low")
+
 class MarketDataSimulator:
     """Simulate general market data"""
     
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._draw = (rng or random).random
+    
     def get_market_data(self, keyword: str) -> Dict[str, Any]:
         """Simulate market data"""
+        draw = self._draw
         return {
-            "market_size": hash(keyword) % 100000 + 10000,
-            "growth_rate": random.uniform(0.05, 0.25),
-            "seasonality": random.choice(["high", "medium", "low"])
+            "market_size": _keyword_baselines(keyword)[4],
+            "growth_rate": 0.05 + (0.25 - 0.05) * draw(),
+            "seasonality": SEASONALITY_LEVELS[int(3 * draw())]
         }
 
 # Example usage and testing
@@ -787,12 +1026,12 @@ if __name__ == "__main__":
     print("⚡ REAL-TIME MARKET PULSE ENGINE TEST")
     print("=" * 60)
     
-    for keyword in test_keywords:
+    results = pulse_engine.get_market_pulse_batch(test_keywords)
+    
+    for keyword, result in results.items():
         print(f"\n🔍 Analyzing: {keyword}")
         print("-" * 40)
         
-        result = pulse_engine.get_market_pulse([keyword])
-        
         if result.get('error'):
             print(f"❌ Analysis failed: {result['error']}")
             continue
@@ -6,113 +6,168 @@ First-of-its-kind visual analysis system for Etsy market intelligence
 """
 
 import os
+import re
+import sys
 import colorsys
 import json
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
-from collections import Counter
+from typing import Dict, List, Any, Tuple, Iterable, FrozenSet, Optional
+from functools import lru_cache
+from bisect import bisect_right
 import math
+import time
+
+def _interned(value: Any) -> Any:
+    """Copy of a literal lookup table with every string sys.intern()'d
+    
+    Keys and labels coming out of the tables are then shared objects, so
+    equality checks against them short-circuit on identity.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {sys.intern(key): _interned(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_interned(item) for item in value]
+    return value
+
+# Palette trend alignment, ranked so the strongest color status wins
+TREND_STATUS_RANKS = {"trending": 1, "rising_fast": 2}
+TREND_ALIGNMENTS = ("neutral", "trending", "high_growth")
+
+COLOR_PSYCHOLOGY_DB = _interned({
+    # Warm Colors
+    "red": {
+        "emotions": ["passion", "energy", "urgency", "love"],
+        "market_performance": {"jewelry": 8.2, "home_decor": 6.5, "art": 7.8},
+        "seasonal_peaks": ["valentine", "christmas", "autumn"],
+        "target_demographics": ["millennials", "gen_x"],
+        "price_impact": 1.15  # 15% premium potential
+    },
+    "orange": {
+        "emotions": ["creativity", "enthusiasm", "warmth", "adventure"],
+        "market_performance": {"home_decor": 7.1, "crafts": 8.5, "pet_accessories": 6.8},
+        "seasonal_peaks": ["autumn", "halloween", "thanksgiving"],
+        "target_demographics": ["gen_z", "millennials"],
+        "price_impact": 1.08
+    },
+    "yellow": {
+        "emotions": ["happiness", "optimism", "creativity", "energy"],
+        "market_performance": {"children": 9.2, "home_decor": 6.3, "art": 7.5},
+        "seasonal_peaks": ["spring", "summer", "easter"],
+        "target_demographics": ["families", "young_adults"],
+        "price_impact": 1.05
+    },
+
+    # Cool Colors  
+    "blue": {
+        "emotions": ["trust", "calm", "professional", "reliable"],
+        "market_performance": {"home_decor": 8.7, "jewelry": 7.2, "office": 9.1},
+        "seasonal_peaks": ["all_year", "spring", "summer"],
+        "target_demographics": ["professionals", "boomers", "gen_x"],
+        "price_impact": 1.12
+    },
+    "green": {
+        "emotions": ["nature", "growth", "harmony", "sustainability"],
+        "market_performance": {"home_decor": 9.3, "plant_accessories": 9.7, "eco_products": 9.8},
+        "seasonal_peaks": ["spring", "summer", "earth_day"],
+        "target_demographics": ["millennials", "eco_conscious"],
+        "price_impact": 1.18  # Strong eco-premium
+    },
+    "purple": {
+        "emotions": ["luxury", "creativity", "mystery", "spirituality"],
+        "market_performance": {"jewelry": 8.8, "art": 8.2, "spiritual": 9.4},
+        "seasonal_peaks": ["spring", "winter_holidays"],
+        "target_demographics": ["gen_z", "creative_professionals"],
+        "price_impact": 1.22  # Luxury premium
+    },
+
+    # Neutral Colors
+    "black": {
+        "emotions": ["elegance", "sophistication", "power", "modern"],
+        "market_performance": {"jewelry": 8.9, "home_decor": 7.8, "fashion": 9.2},
+        "seasonal_peaks": ["all_year", "winter", "formal_events"],
+        "target_demographics": ["millennials", "gen_x", "professionals"],
+        "price_impact": 1.20  # Premium positioning
+    },
+    "white": {
+        "emotions": ["purity", "simplicity", "cleanliness", "minimalism"],
+        "market_performance": {"home_decor": 9.1, "wedding": 9.8, "minimalist": 9.5},
+        "seasonal_peaks": ["spring", "summer", "weddings"],
+        "target_demographics": ["millennials", "minimalists"],
+        "price_impact": 1.10
+    },
+    "gray": {
+        "emotions": ["neutral", "modern", "professional", "balanced"],
+        "market_performance": {"home_decor": 8.2, "office": 8.7, "tech": 8.4},
+        "seasonal_peaks": ["all_year", "modern_trends"],
+        "target_demographics": ["professionals", "modern_minimalists"],
+        "price_impact": 1.07
+    },
+
+    # Earth Tones (Trending 2024-2025)
+    "sage_green": {
+        "emotions": ["calm", "nature", "sophistication", "wellness"],
+        "market_performance": {"home_decor": 9.6, "wedding": 9.2, "wellness": 9.4},
+        "seasonal_peaks": ["spring", "summer", "wellness_trends"],
+        "target_demographics": ["millennials", "wellness_focused"],
+        "price_impact": 1.25,  # Hot trend premium
+        "trend_status": "rising_fast"
+    },
+    "terracotta": {
+        "emotions": ["warmth", "earthiness", "comfort", "authenticity"],
+        "market_performance": {"home_decor": 9.1, "pottery": 9.5, "boho": 8.8},
+        "seasonal_peaks": ["autumn", "winter", "cozy_season"],
+        "target_demographics": ["millennials", "boho_enthusiasts"],
+        "price_impact": 1.15,
+        "trend_status": "trending"
+    },
+    "dusty_pink": {
+        "emotions": ["softness", "romance", "femininity", "vintage"],
+        "market_performance": {"jewelry": 8.9, "wedding": 9.3, "nursery": 9.0},
+        "seasonal_peaks": ["spring", "valentine", "weddings"],
+        "target_demographics": ["gen_z", "romantic_aesthetics"],
+        "price_impact": 1.18,
+        "trend_status": "stable_high"
+    }
+})
+
+# Per-color summaries frozen once so analyze_color_palette avoids
+# re-deriving averages and walking nested dicts on every call:
+# (avg_performance, emotions, demographics, seasons, log_price_impact, trend_rank).
+# Price impacts are stored as logarithms so a palette's combined impact is a
+# running sum and a single exp().
+def _build_color_fast_db() -> Dict[str, Tuple]:
+    fast_db = {}
+    for color_name, color_data in COLOR_PSYCHOLOGY_DB.items():
+        performance = color_data.get("market_performance", {})
+        fast_db[color_name.lower()] = (
+            sum(performance.values()) / len(performance) if performance else 0.0,
+            tuple(color_data.get("emotions", ())),
+            tuple(color_data.get("target_demographics", ())),
+            tuple(color_data.get("seasonal_peaks", ())),
+            math.log(color_data.get("price_impact", 1.0)),
+            TREND_STATUS_RANKS.get(color_data.get("trend_status"), 0),
+        )
+    return fast_db
+
+_COLOR_FAST_DB = _build_color_fast_db()
+
+@lru_cache(maxsize=256)
+def _lookup_color(name: str):
+    """Fast color record for a Vision color name, case-insensitively
+    
+    Vision returns a small, repetitive vocabulary of color names, so the
+    normalised lookup is memoised and shared by every analyzer.
+    """
+    return _COLOR_FAST_DB.get(name.lower())
 
 class ColorPsychologyAnalyzer:
     """Advanced color psychology analysis for market intelligence"""
     
     def __init__(self):
-        self.color_psychology_db = {
-            # Warm Colors
-            "red": {
-                "emotions": ["passion", "energy", "urgency", "love"],
-                "market_performance": {"jewelry": 8.2, "home_decor": 6.5, "art": 7.8},
-                "seasonal_peaks": ["valentine", "christmas", "autumn"],
-                "target_demographics": ["millennials", "gen_x"],
-                "price_impact": 1.15  # 15% premium potential
-            },
-            "orange": {
-                "emotions": ["creativity", "enthusiasm", "warmth", "adventure"],
-                "market_performance": {"home_decor": 7.1, "crafts": 8.5, "pet_accessories": 6.8},
-                "seasonal_peaks": ["autumn", "halloween", "thanksgiving"],
-                "target_demographics": ["gen_z", "millennials"],
-                "price_impact": 1.08
-            },
-            "yellow": {
-                "emotions": ["happiness", "optimism", "creativity", "energy"],
-                "market_performance": {"children": 9.2, "home_decor": 6.3, "art": 7.5},
-                "seasonal_peaks": ["spring", "summer", "easter"],
-                "target_demographics": ["families", "young_adults"],
-                "price_impact": 1.05
-            },
-            
-            # Cool Colors  
-            "blue": {
-                "emotions": ["trust", "calm", "professional", "reliable"],
-                "market_performance": {"home_decor": 8.7, "jewelry": 7.2, "office": 9.1},
-                "seasonal_peaks": ["all_year", "spring", "summer"],
-                "target_demographics": ["professionals", "boomers", "gen_x"],
-                "price_impact": 1.12
-            },
-            "green": {
-                "emotions": ["nature", "growth", "harmony", "sustainability"],
-                "market_performance": {"home_decor": 9.3, "plant_accessories": 9.7, "eco_products": 9.8},
-                "seasonal_peaks": ["spring", "summer", "earth_day"],
-                "target_demographics": ["millennials", "eco_conscious"],
-                "price_impact": 1.18  # Strong eco-premium
-            },
-            "purple": {
-                "emotions": ["luxury", "creativity", "mystery", "spirituality"],
-                "market_performance": {"jewelry": 8.8, "art": 8.2, "spiritual": 9.4},
-                "seasonal_peaks": ["spring", "winter_holidays"],
-                "target_demographics": ["gen_z", "creative_professionals"],
-                "price_impact": 1.22  # Luxury premium
-            },
-            
-            # Neutral Colors
-            "black": {
-                "emotions": ["elegance", "sophistication", "power", "modern"],
-                "market_performance": {"jewelry": 8.9, "home_decor": 7.8, "fashion": 9.2},
-                "seasonal_peaks": ["all_year", "winter", "formal_events"],
-                "target_demographics": ["millennials", "gen_x", "professionals"],
-                "price_impact": 1.20  # Premium positioning
-            },
-            "white": {
-                "emotions": ["purity", "simplicity", "cleanliness", "minimalism"],
-                "market_performance": {"home_decor": 9.1, "wedding": 9.8, "minimalist": 9.5},
-                "seasonal_peaks": ["spring", "summer", "weddings"],
-                "target_demographics": ["millennials", "minimalists"],
-                "price_impact": 1.10
-            },
-            "gray": {
-                "emotions": ["neutral", "modern", "professional", "balanced"],
-                "market_performance": {"home_decor": 8.2, "office": 8.7, "tech": 8.4},
-                "seasonal_peaks": ["all_year", "modern_trends"],
-                "target_demographics": ["professionals", "modern_minimalists"],
-                "price_impact": 1.07
-            },
-            
-            # Earth Tones (Trending 2024-2025)
-            "sage_green": {
-                "emotions": ["calm", "nature", "sophistication", "wellness"],
-                "market_performance": {"home_decor": 9.6, "wedding": 9.2, "wellness": 9.4},
-                "seasonal_peaks": ["spring", "summer", "wellness_trends"],
-                "target_demographics": ["millennials", "wellness_focused"],
-                "price_impact": 1.25,  # Hot trend premium
-                "trend_status": "rising_fast"
-            },
-            "terracotta": {
-                "emotions": ["warmth", "earthiness", "comfort", "authenticity"],
-                "market_performance": {"home_decor": 9.1, "pottery": 9.5, "boho": 8.8},
-                "seasonal_peaks": ["autumn", "winter", "cozy_season"],
-                "target_demographics": ["millennials", "boho_enthusiasts"],
-                "price_impact": 1.15,
-                "trend_status": "trending"
-            },
-            "dusty_pink": {
-                "emotions": ["softness", "romance", "femininity", "vintage"],
-                "market_performance": {"jewelry": 8.9, "wedding": 9.3, "nursery": 9.0},
-                "seasonal_peaks": ["spring", "valentine", "weddings"],
-                "target_demographics": ["gen_z", "romantic_aesthetics"],
-                "price_impact": 1.18,
-                "trend_status": "stable_high"
-            }
-        }
+        self.color_psychology_db = COLOR_PSYCHOLOGY_DB
     
     def analyze_color_palette(self, dominant_colors: List[str]) -> Dict[str, Any]:
         """Analyze color palette for market psychology insights"""
@@ -120,50 +175,60 @@ class ColorPsychologyAnalyzer:
         analysis = {
             "color_emotions": [],
             "market_performance_score": 0.0,
-            "target_demographics": Counter(),
-            "seasonal_opportunities": Counter(),
+            "target_demographics": {},
+            "seasonal_opportunities": {},
             "pricing_impact": 1.0,
             "trend_alignment": "neutral",
             "recommendations": []
         }
         
+        # Bind the hot containers once; plain dict counting beats Counter for
+        # single increments
+        color_emotions = analysis["color_emotions"]
+        demographic_counts = {}
+        season_counts = {}
+        log_pricing_impact = 0.0
+        trend_rank = 0
+        lookup_color = _lookup_color
         total_score = 0
         color_count = len(dominant_colors)
         
         for color in dominant_colors:
-            color_data = self.color_psychology_db.get(color.lower(), {})
+            rec = lookup_color(color)
             
-            if color_data:
+            if rec:
+                avg_performance, emotions, demographics, seasons, log_price_impact, color_trend_rank = rec
+                
                 # Aggregate emotions
-                analysis["color_emotions"].extend(color_data.get("emotions", []))
+                color_emotions.extend(emotions)
                 
                 # Calculate market performance
-                avg_performance = sum(color_data.get("market_performance", {}).values()) / max(1, len(color_data.get("market_performance", {})))
                 total_score += avg_performance
                 
                 # Aggregate demographics
-                for demo in color_data.get("target_demographics", []):
-                    analysis["target_demographics"][demo] += 1
+                for demo in demographics:
+                    demographic_counts[demo] = demographic_counts.get(demo, 0) + 1
                 
                 # Aggregate seasonal peaks
-                for season in color_data.get("seasonal_peaks", []):
-                    analysis["seasonal_opportunities"][season] += 1
+                for season in seasons:
+                    season_counts[season] = season_counts.get(season, 0) + 1
                 
                 # Calculate pricing impact
-                analysis["pricing_impact"] *= color_data.get("price_impact", 1.0)
+                log_pricing_impact += log_price_impact
                 
                 # Check trend status
-                if color_data.get("trend_status") == "rising_fast":
-                    analysis["trend_alignment"] = "high_growth"
-                elif color_data.get("trend_status") == "trending":
-                    if analysis["trend_alignment"] != "high_growth":
-                        analysis["trend_alignment"] = "trending"
+                if color_trend_rank > trend_rank:
+                    trend_rank = color_trend_rank
+        
+        analysis["trend_alignment"] = TREND_ALIGNMENTS[trend_rank]
+        analysis["target_demographics"] = demographic_counts
+        analysis["seasonal_opportunities"] = season_counts
         
         # Calculate overall market performance score
         analysis["market_performance_score"] = total_score / max(1, color_count)
         
         # Normalize pricing impact
-        analysis["pricing_impact"] = min(analysis["pricing_impact"], 1.5)  # Cap at 50% premium
+        analysis["pricing_impact"] = min(math.exp(log_pricing_impact), 1.5)  # Cap at 50% premium
         
         # Generate recommendations
         analysis["recommendations"] = self._generate_color_recommendations(analysis)
@@ -191,54 +256,108 @@ class ColorPsychologyAnalyzer:
             recommendations.append(f"💰 Color palette supports premium pricing (+{((analysis['pricing_impact']-1)*100):.0f}%)")
         
         # Seasonal recommendations
-        top_season = analysis["seasonal_opportunities"].most_common(1)
-        if top_season:
-            season_name = top_season[0][0].replace("_", " ").title()
+        seasonal_opportunities = analysis["seasonal_opportunities"]
+        if seasonal_opportunities:
+            top_season = max(seasonal_opportunities, key=seasonal_opportunities.get)
+            season_name = top_season.replace("_", " ").title()
             recommendations.append(f"🗓️ Optimal for {season_name} marketing campaigns.")
         
         return recommendations
 
+STYLE_CATEGORIES = _interned({
+    "minimalist": {
+        "visual_markers": ["clean_lines", "white_space", "simple_geometry", "monochrome"],
+        "market_performance": 9.2,
+        "target_demographics": ["millennials", "professionals", "urban_dwellers"],
+        "trending_score": 9.5,
+        "price_premium": 1.18
+    },
+    "bohemian": {
+        "visual_markers": ["patterns", "earth_tones", "natural_textures", "layered"],
+        "market_performance": 8.7,
+        "target_demographics": ["gen_z", "creative_professionals", "free_spirits"],
+        "trending_score": 8.2,
+        "price_premium": 1.12
+    },
+    "vintage": {
+        "visual_markers": ["aged_textures", "classic_patterns", "muted_colors", "retro_elements"],
+        "market_performance": 8.4,
+        "target_demographics": ["millennials", "nostalgia_lovers", "unique_seekers"],
+        "trending_score": 7.8,
+        "price_premium": 1.15
+    },
+    "modern": {
+        "visual_markers": ["bold_colors", "geometric_shapes", "sleek_finish", "contemporary"],
+        "market_performance": 8.9,
+        "target_demographics": ["gen_x", "professionals", "tech_enthusiasts"],
+        "trending_score": 8.5,
+        "price_premium": 1.14
+    },
+    "rustic": {
+        "visual_markers": ["wood_textures", "natural_materials", "weathered_look", "handcrafted"],
+        "market_performance": 8.3,
+        "target_demographics": ["rural_dwellers", "craft_lovers", "authentic_seekers"],
+        "trending_score": 7.6,
+        "price_premium": 1.10
+    }
+})
+
+# Style markers laid out as one bit each, style by style: every style owns a
+# contiguous run of bits (style, first bit, marker count), and each marker
+# word maps to the mask of markers it appears in. Matching a text is then an
+# OR over the words it contains, with no per-style bookkeeping.
+def _build_style_bit_layout() -> Tuple[Tuple[Tuple[str, int, int], ...], Dict[str, int]]:
+    slots = []
+    word_masks: Dict[str, int] = {}
+    bit = 0
+    for style_name, style_data in STYLE_CATEGORIES.items():
+        markers = style_data["visual_markers"]
+        slots.append((style_name, bit, len(markers)))
+        for position, marker in enumerate(markers):
+            for word in marker.split("_"):
+                word_masks[word] = word_masks.get(word, 0) | (1 << (bit + position))
+        bit += len(markers)
+    return tuple(slots), word_masks
+
+_STYLE_SLOTS, _STYLE_WORD_MASKS = _build_style_bit_layout()
+
+# Marker word lengths, longest first, for prefix lookups of inflected words
+_STYLE_WORD_LENGTHS = tuple(sorted({len(word) for word in _STYLE_WORD_MASKS}, reverse=True))
+
+# Words of a tag/description; underscores split too, so "earth_tones" tags match
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+@lru_cache(maxsize=1024)
+def _match_styles(tokens: FrozenSet[str]) -> Tuple[Tuple[str, Tuple[int, ...]], ...]:
+    """Matched marker positions per style, in STYLE_CATEGORIES order
+    
+    A marker word matches a (lowercased) word that starts with it, so
+    inflections still hit ("wood" in "wooden", "earth" in "earthy") while a
+    marker buried mid-word does not ("art" in "cartoon"). Listings are
+    frequently re-analysed with the same tags/description, so matching is
+    memoised on the token set and returns immutable (style, positions) pairs.
+    """
+    word_masks = _STYLE_WORD_MASKS
+    matched = 0
+    for token in tokens:
+        for length in _STYLE_WORD_LENGTHS:
+            if length <= len(token):
+                matched |= word_masks.get(token[:length], 0)
+    if not matched:
+        return ()
+    
+    styles = []
+    for style_name, first_bit, marker_count in _STYLE_SLOTS:
+        hits = (matched >> first_bit) & ((1 << marker_count) - 1)
+        if hits:
+            styles.append((style_name, tuple(i for i in range(marker_count) if hits >> i & 1)))
+    return tuple(styles)
+
 class StyleClassificationEngine:
     """Advanced style classification for visual trend analysis"""
     
     def __init__(self):
-        self.style_categories = {
-            "minimalist": {
-                "visual_markers": ["clean_lines", "white_space", "simple_geometry", "monochrome"],
-                "market_performance": 9.2,
-                "target_demographics": ["millennials", "professionals", "urban_dwellers"],
-                "trending_score": 9.5,
-                "price_premium": 1.18
-            },
-            "bohemian": {
-                "visual_markers": ["patterns", "earth_tones", "natural_textures", "layered"],
-                "market_performance": 8.7,
-                "target_demographics": ["gen_z", "creative_professionals", "free_spirits"],
-                "trending_score": 8.2,
-                "price_premium": 1.12
-            },
-            "vintage": {
-                "visual_markers": ["aged_textures", "classic_patterns", "muted_colors", "retro_elements"],
-                "market_performance": 8.4,
-                "target_demographics": ["millennials", "nostalgia_lovers", "unique_seekers"],
-                "trending_score": 7.8,
-                "price_premium": 1.15
-            },
-            "modern": {
-                "visual_markers": ["bold_colors", "geometric_shapes", "sleek_finish", "contemporary"],
-                "market_performance": 8.9,
-                "target_demographics": ["gen_x", "professionals", "tech_enthusiasts"],
-                "trending_score": 8.5,
-                "price_premium": 1.14
-            },
-            "rustic": {
-                "visual_markers": ["wood_textures", "natural_materials", "weathered_look", "handcrafted"],
-                "market_performance": 8.3,
-                "target_demographics": ["rural_dwellers", "craft_lovers", "authentic_seekers"],
-                "trending_score": 7.6,
-                "price_premium": 1.10
-            }
-        }
+        self.style_categories = STYLE_CATEGORIES
     
     def classify_style(self, image_tags: List[str], description: str) -> Dict[str, Any]:
         """Classify visual style based on tags and description"""
@@ -246,36 +365,39 @@ class StyleClassificationEngine:
         style_scores = {}
         
         # Analyze tags and description
-        combined_text = " ".join(image_tags + [description]).lower()
-        
-        for style_name, style_data in self.style_categories.items():
-            score = 0
-            markers_found = []
-            
-            for marker in style_data["visual_markers"]:
-                marker_words = marker.replace("_", " ").split()
-                if any(word in combined_text for word in marker_words):
-                    score += 1
-                    markers_found.append(marker)
-            
-            if score > 0:
-                style_scores[style_name] = {
-                    "confidence": score / len(style_data["visual_markers"]),
-                    "markers_found": markers_found,
-                    "market_performance": style_data["market_performance"],
-                    "trending_score": style_data["trending_score"],
-                    "price_premium": style_data["price_premium"],
-                    "target_demographics": style_data["target_demographics"]
-                }
+        tokens = frozenset(_TOKEN_PATTERN.findall(" ".join(image_tags + [description]).lower()))
+        
+        # Dominant (highest confidence) and best (highest confidence-weighted
+        # market performance) styles are tracked while scoring; strict
+        # comparisons keep the first style on ties, as max() would
+        dominant_style, dominant_confidence = None, 0.0
+        best_style, best_composite = None, 0.0
+        
+        for style_name, positions in _match_styles(tokens):
+            style_data = self.style_categories[style_name]
+            markers = style_data["visual_markers"]
+            confidence = len(positions) / len(markers)
+            composite = style_data["market_performance"] * confidence
+            style_scores[style_name] = {
+                "confidence": confidence,
+                "markers_found": [markers[i] for i in positions],
+                "market_performance": style_data["market_performance"],
+                "trending_score": style_data["trending_score"],
+                "price_premium": style_data["price_premium"],
+                "target_demographics": style_data["target_demographics"]
+            }
+            if dominant_style is None or confidence > dominant_confidence:
+                dominant_style, dominant_confidence = style_name, confidence
+            if best_style is None or composite > best_composite:
+                best_style, best_composite = style_name, composite
         
         # Find dominant style
         if style_scores:
-            dominant_style = max(style_scores.keys(), key=lambda x: style_scores[x]["confidence"])
             return {
                 "dominant_style": dominant_style,
-                "confidence": style_scores[dominant_style]["confidence"],
+                "confidence": dominant_confidence,
                 "all_styles": style_scores,
-                "style_recommendations": self._generate_style_recommendations(style_scores)
+                "style_recommendations": self._generate_style_recommendations(style_scores, best_style)
             }
         
         return {
@@ -285,16 +407,21 @@ class StyleClassificationEngine:
             "style_recommendations": ["Consider enhancing visual style elements for better categorization"]
         }
     
-    def _generate_style_recommendations(self, style_scores: Dict[str, Any]) -> List[str]:
-        """Generate style-based recommendations"""
+    def _generate_style_recommendations(self, style_scores: Dict[str, Any], best_style: Optional[str] = None) -> List[str]:
+        """Generate style-based recommendations
+        
+        best_style, when already known, is the style with the highest
+        market_performance * confidence.
+        """
         recommendations = []
         
         if not style_scores:
             return ["Consider defining a clearer visual style for better market positioning"]
         
         # Find best performing style
-        best_style = max(style_scores.keys(), 
-                        key=lambda x: style_scores[x]["market_performance"] * style_scores[x]["confidence"])
+        if best_style is None:
+            best_style = max(style_scores,
+                             key=lambda x: style_scores[x]["market_performance"] * style_scores[x]["confidence"])
         
         best_data = style_scores[best_style]
         
@@ -309,79 +436,156 @@ class StyleClassificationEngine:
         
         return recommendations
 
+# Quality tiers per signal, indexed with bisect_right over the minimum count
+# for each tier above the lowest: (factor, score contribution, recommendation)
+TAG_COUNT_TIERS = (3, 5)
+TAG_QUALITY = (
+    (0.4, 0.05, "📸 Consider clearer subject focus - low tag recognition"),
+    (0.7, 0.15, None),
+    (0.9, 0.2, None),
+)
+CATEGORY_COUNT_TIERS = (2,)
+CATEGORY_QUALITY = (
+    (0.5, 0.1, "🎯 Improve composition - unclear categorization"),
+    (0.8, 0.15, None),
+)
+DESCRIPTION_LENGTH_TIERS = (16, 31)
+DESCRIPTION_QUALITY = (
+    (0.4, 0.05, "🔍 Image may lack detail - generic description generated"),
+    (0.7, 0.15, None),
+    (0.9, 0.2, None),
+)
+COLOR_QUALITY = (
+    (0.5, 0.05, "🌈 Consider more vibrant colors for better appeal"),
+    (0.8, 0.1, None),
+)
+QUALITY_VERDICT_TIERS = (0.6, 0.8)
+QUALITY_VERDICTS = (
+    "⚠️ Image quality needs improvement for better market performance.",
+    "👍 Good image quality with room for improvement.",
+    "✅ Excellent image quality! Great for market success.",
+)
+MARKET_READINESS_TIERS = (0.5, 0.7)
+MARKET_READINESS = ("low", "medium", "high")
+
 class ImageQualityAssessor:
     """Assess image quality and provide improvement recommendations"""
     
     def assess_quality(self, image_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Assess image quality based on Azure Vision analysis"""
         
-        quality_score = 0.0
-        quality_factors = {}
-        recommendations = []
-        
-        # Check if we have tags (indicates clear subject recognition)
-        tags = image_analysis.get("tags", [])
-        if len(tags) >= 5:
-            quality_factors["subject_clarity"] = 0.9
-            quality_score += 0.2
-        elif len(tags) >= 3:
-            quality_factors["subject_clarity"] = 0.7
-            quality_score += 0.15
-        else:
-            quality_factors["subject_clarity"] = 0.4
-            quality_score += 0.05
-            recommendations.append("📸 Consider clearer subject focus - low tag recognition")
-        
-        # Check categories (indicates good composition)
-        categories = image_analysis.get("categories", [])
-        if len(categories) >= 2:
-            quality_factors["composition"] = 0.8
-            quality_score += 0.15
-        else:
-            quality_factors["composition"] = 0.5
-            quality_score += 0.1
-            recommendations.append("🎯 Improve composition - unclear categorization")
-        
-        # Check description quality
-        description = image_analysis.get("description", "")
-        if len(description) > 30:
-            quality_factors["description_detail"] = 0.9
-            quality_score += 0.2
-        elif len(description) > 15:
-            quality_factors["description_detail"] = 0.7
-            quality_score += 0.15
-        else:
-            quality_factors["description_detail"] = 0.4
-            quality_score += 0.05
-            recommendations.append("🔍 Image may lack detail - generic description generated")
-        
-        # Color information quality
-        color_info = image_analysis.get("color", {})
-        if color_info.get("dominantColors", []):
-            quality_factors["color_richness"] = 0.8
-            quality_score += 0.1
-        else:
-            quality_factors["color_richness"] = 0.5
-            quality_score += 0.05
-            recommendations.append("🌈 Consider more vibrant colors for better appeal")
-        
-        # Overall assessment
-        quality_score = min(quality_score, 1.0)  # Cap at 1.0
+        # Tags indicate clear subject recognition, categories good composition
+        subject_clarity, tag_score, tag_tip = TAG_QUALITY[
+            bisect_right(TAG_COUNT_TIERS, len(image_analysis.get("tags", [])))
+        ]
+        composition, category_score, category_tip = CATEGORY_QUALITY[
+            bisect_right(CATEGORY_COUNT_TIERS, len(image_analysis.get("categories", [])))
+        ]
+        description_detail, description_score, description_tip = DESCRIPTION_QUALITY[
+            bisect_right(DESCRIPTION_LENGTH_TIERS, len(image_analysis.get("description", "")))
+        ]
+        color_richness, color_score, color_tip = COLOR_QUALITY[
+            bool(image_analysis.get("color", {}).get("dominantColors", []))
+        ]
+        
+        quality_factors = {
+            "subject_clarity": subject_clarity,
+            "composition": composition,
+            "description_detail": description_detail,
+            "color_richness": color_richness
+        }
+        quality_score = min(tag_score + category_score + description_score + color_score, 1.0)  # Cap at 1.0
         
-        if quality_score >= 0.8:
-            recommendations.insert(0, "✅ Excellent image quality! Great for market success.")
-        elif quality_score >= 0.6:
-            recommendations.insert(0, "👍 Good image quality with room for improvement.")
-        else:
-            recommendations.insert(0, "⚠️ Image quality needs improvement for better market performance.")
+        # Overall assessment leads, followed by the per-signal tips
+        recommendations = [QUALITY_VERDICTS[bisect_right(QUALITY_VERDICT_TIERS, quality_score)]]
+        recommendations.extend(
+            tip for tip in (tag_tip, category_tip, description_tip, color_tip) if tip
+        )
         
         return {
             "overall_score": quality_score,
             "quality_factors": quality_factors,
             "recommendations": recommendations,
-            "market_readiness": "high" if quality_score >= 0.7 else "medium" if quality_score >= 0.5 else "low"
+            "market_readiness": MARKET_READINESS[bisect_right(MARKET_READINESS_TIERS, quality_score)]
+        }
+
+def _visual_score(color_performance: float, style_confidence: float, quality: float) -> float:
+    """Weighted visual intelligence score from the three analyzer outputs
+    
+    Color performance (0-10, capped) weighs 30%, style confidence 30% and
+    image quality 40%; missing (zero) components contribute nothing.
+    """
+    score = 0.0
+    if color_performance:
+        score += min(color_performance / 10.0, 1.0) * 0.3
+    if style_confidence:
+        score += style_confidence * 0.3
+    if quality:
+        score += quality * 0.4
+    return score
+
+@dataclass(slots=True)
+class VisualIntelligenceResult:
+    """Visual intelligence analysis of one image
+    
+    Kept as a slotted object inside the service; to_dict() gives the form
+    returned by the API.
+    """
+    visual_intelligence_score: float
+    color_psychology: Dict[str, Any]
+    style_classification: Dict[str, Any]
+    image_quality: Dict[str, Any]
+    market_insights: Dict[str, Any]
+    competitive_advantages: List[str]
+    optimization_recommendations: List[str]
+    timestamp: str
+    error: Optional[str] = None
+    
+    @classmethod
+    def failed(cls, error: str, timestamp: str) -> "VisualIntelligenceResult":
+        """Result for an analysis that raised"""
+        return cls(0.0, {}, {}, {}, {}, [], [], timestamp, error)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """API form; failed analyses carry only the error and timestamp"""
+        if self.error is not None:
+            return {"error": self.error, "timestamp": self.timestamp}
+        return {
+            "visual_intelligence_score": self.visual_intelligence_score,
+            "color_psychology": self.color_psychology,
+            "style_classification": self.style_classification,
+            "image_quality": self.image_quality,
+            "market_insights": self.market_insights,
+            "competitive_advantages": self.competitive_advantages,
+            "optimization_recommendations": self.optimization_recommendations,
+            "timestamp": self.timestamp
         }
 
+def _insufficient_data_result(timestamp: str) -> VisualIntelligenceResult:
+    """Result for an image with no tags, description or dominant colors
+    
+    Built fresh per call (callers may mutate it) without running any of the
+    analyzers.
+    """
+    return VisualIntelligenceResult(
+        visual_intelligence_score=0.0,
+        color_psychology={},
+        style_classification={},
+        image_quality={},
+        market_insights={
+            "overall_market_potential": "low",
+            "estimated_performance_boost": "0%",
+            "key_strengths": [],
+            "improvement_areas": ["Insufficient visual data for analysis"],
+            "market_positioning": "budget"
+        },
+        competitive_advantages=[],
+        optimization_recommendations=[
+            "📸 Insufficient visual data - no tags, description or colors were detected"
+        ],
+        timestamp=timestamp
+    )
+
 class VisualIntelligenceEngine:
     """Main Visual Intelligence Engine - Revolutionary visual market analysis"""
     
@@ -392,7 +596,28 @@ class VisualIntelligenceEngine:
     
     def analyze_visual_intelligence(self, image_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Comprehensive visual intelligence analysis"""
+        return self._analyze(image_analysis, _now_isoformat()).to_dict()
+    
+    def analyze(self, image_analysis: Dict[str, Any]) -> VisualIntelligenceResult:
+        """Comprehensive visual intelligence analysis as a result object
         
+        For in-process callers; analyze_visual_intelligence returns the same
+        analysis in its API (dict) form.
+        """
+        return self._analyze(image_analysis, _now_isoformat())
+    
+    def analyze_batch(self, listings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Visual intelligence analysis for many listings, in input order
+        
+        Equivalent to calling analyze_visual_intelligence per listing, but
+        the analyzers are resolved once and every result shares a single
+        timestamp.
+        """
+        analyze = self._analyze
+        timestamp = _now_isoformat()
+        return [analyze(image_analysis, timestamp).to_dict() for image_analysis in listings]
+    
+    def _analyze(self, image_analysis: Dict[str, Any], timestamp: str) -> VisualIntelligenceResult:
         try:
             # Extract visual elements
             tags = image_analysis.get("tags", [])
@@ -400,6 +625,10 @@ class VisualIntelligenceEngine:
             categories = image_analysis.get("categories", [])
             colors = image_analysis.get("color", {}).get("dominantColors", [])
             
+            # Nothing to analyze: skip the analyzers entirely
+            if not (tags or description or colors):
+                return _insufficient_data_result(timestamp)
+            
             # Run all analysis components
             color_analysis = self.color_analyzer.analyze_color_palette(colors) if colors else {}
             style_analysis = self.style_classifier.classify_style(tags, description)
@@ -411,44 +640,27 @@ class VisualIntelligenceEngine:
             # Generate comprehensive insights
             insights = self._generate_comprehensive_insights(color_analysis, style_analysis, quality_analysis, visual_score)
             
-            return {
-                "visual_intelligence_score": visual_score,
-                "color_psychology": color_analysis,
-                "style_classification": style_analysis,
-                "image_quality": quality_analysis,
-                "market_insights": insights,
-                "competitive_advantages": self._identify_competitive_advantages(color_analysis, style_analysis),
-                "optimization_recommendations": self._generate_optimization_recommendations(color_analysis, style_analysis, quality_analysis),
-                "timestamp": datetime.now().isoformat()
-            }
+            return VisualIntelligenceResult(
+                visual_intelligence_score=visual_score,
+                color_psychology=color_analysis,
+                style_classification=style_analysis,
+                image_quality=quality_analysis,
+                market_insights=insights,
+                competitive_advantages=self._identify_competitive_advantages(color_analysis, style_analysis),
+                optimization_recommendations=self._generate_optimization_recommendations(color_analysis, style_analysis, quality_analysis),
+                timestamp=timestamp
+            )
             
         except Exception as e:
-            return {
-                "error": f"Visual intelligence analysis failed: {str(e)}",
-                "timestamp": datetime.now().isoformat()
-            }
+            return VisualIntelligenceResult.failed(f"Visual intelligence analysis failed: {str(e)}", timestamp)
     
     def _calculate_visual_score(self, color_analysis: Dict, style_analysis: Dict, quality_analysis: Dict) -> float:
         """Calculate overall visual intelligence score"""
-        
-        score_components = []
-        
-        # Color score (30% weight)
-        if color_analysis.get("market_performance_score"):
-            color_score = min(color_analysis["market_performance_score"] / 10.0, 1.0)
-            score_components.append(color_score * 0.3)
-        
-        # Style score (30% weight)
-        if style_analysis.get("confidence"):
-            style_score = style_analysis["confidence"]
-            score_components.append(style_score * 0.3)
-        
-        # Quality score (40% weight)
-        if quality_analysis.get("overall_score"):
-            quality_score = quality_analysis["overall_score"]
-            score_components.append(quality_score * 0.4)
-        
-        return sum(score_components) if score_components else 0.0
+        return _visual_score(
+            color_analysis.get("market_performance_score", 0.0),
+            style_analysis.get("confidence", 0.0),
+            quality_analysis.get("overall_score", 0.0)
+        )
     
     def _generate_comprehensive_insights(self, color_analysis: Dict, style_analysis: Dict, quality_analysis: Dict, visual_score: float) -> Dict[str, Any]:
         """Generate comprehensive market insights"""
@@ -487,19 +699,27 @@ class VisualIntelligenceEngine:
         """Identify unique competitive advantages"""
         advantages = []
         
+        # Without a palette (no dominant colors) only the style premium applies
+        if color_analysis:
+            trend_alignment = color_analysis.get("trend_alignment")
+            color_premium = color_analysis.get("pricing_impact", 1.0)
+            color_performance = color_analysis.get("market_performance_score", 0)
+        else:
+            trend_alignment, color_premium, color_performance = None, 1.0, 0
+        
+        dominant_style = style_analysis.get("all_styles", {}).get(style_analysis.get("dominant_style", ""))
+        style_premium = dominant_style.get("price_premium", 1.0) if dominant_style else 1.0
+        
         # Trend alignment advantages
-        if color_analysis.get("trend_alignment") == "high_growth":
+        if trend_alignment == "high_growth":
             advantages.append("🚀 First-mover advantage with rising color trends")
         
         # Premium positioning advantages
-        color_premium = color_analysis.get("pricing_impact", 1.0)
-        style_premium = style_analysis.get("all_styles", {}).get(style_analysis.get("dominant_style", ""), {}).get("price_premium", 1.0)
-        
         if color_premium > 1.15 or style_premium > 1.15:
             advantages.append("💎 Strong premium positioning potential")
         
         # Market performance advantages
-        if color_analysis.get("market_performance_score", 0) > 8.5:
+        if color_performance > 8.5:
             advantages.append("🎯 Exceptional color market appeal")
         
         return advantages
@@ -520,10 +740,38 @@ class VisualIntelligenceEngine:
         # Seasonal recommendations
         seasonal_ops = color_analysis.get("seasonal_opportunities", {})
         if seasonal_ops:
-            top_season = max(seasonal_ops.keys(), key=seasonal_ops.get)
+            top_season = max(seasonal_ops, key=seasonal_ops.get)
             recommendations.append(f"📅 Focus marketing during {top_season.replace('_', ' ').title()} season")
         
-        return list(set(recommendations))  # Remove duplicates
+        return list(dict.fromkeys(recommendations))  # Remove duplicates, keep order
+
+# Shared engine; the analyzers hold no per-request state
+_default_engine = None
+
+def get_engine() -> VisualIntelligenceEngine:
+    """Get the shared Visual Intelligence Engine instance"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = VisualIntelligenceEngine()
+    return _default_engine
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recently rendered second
+_timestamp_cache = (None, "")
+
+def _now_isoformat() -> str:
+    """datetime.now().isoformat() with the per-second prefix rendered once
+    
+    Only the microsecond suffix is formatted per call.
+    """
+    global _timestamp_cache
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _timestamp_cache
+    if cached_second != second:
+        prefix = datetime.fromtimestamp(second).isoformat()
+        _timestamp_cache = (second, prefix)
+    microsecond = int((now - second) * 1_000_000)
+    return f"{prefix}.{microsecond:06d}" if microsecond else prefix
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -1,12 +1,16 @@
 import requests
 import json
+from requests.adapters import HTTPAdapter
 
 url = "http://127.0.0.1:5000/api/analyze"
-headers = {"Content-Type": "application/json"}
 data = {"url": "https://www.etsy.com/listing/123456/handmade-silver-necklace"}
 
+# Reuse pooled connections across calls; json= sets the Content-Type header
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 try:
-    response = requests.post(url, headers=headers, data=json.dumps(data))
+    response = session.post(url, json=data)
     response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
     print(json.dumps(response.json(), indent=4))
 except requests.exceptions.RequestException as e:
@@ -8,6 +8,9 @@ Direct comparison of AI Simulator vs Real Azure AI Services
 import os
 import sys
 import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add backend to path
@@ -17,42 +20,152 @@ sys.path.append('/home/user/webapp/backend/src')
 def load_env_vars():
     env_path = '/home/user/webapp/.env'
     try:
+        from dotenv import dotenv_values
         with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
+            values = dotenv_values(stream=f)
+        os.environ.update({key: value for key, value in values.items() if value is not None})
     except Exception as e:
         print(f"❌ Error loading .env: {e}")
 
-def test_image_analysis_comparison():
-    """Compare image analysis between simulator and real Azure"""
+# Azure responses from previous runs, keyed by "<kind>:<url or text>". The
+# inputs below are fixed, so repeat runs can skip the network entirely;
+# pass --no-cache to ignore (and refresh) the stored responses. Only responses
+# from configured Azure clients are stored (never the simulator fallback), each
+# tagged with its source, and entries expire after RESPONSE_CACHE_TTL_SECONDS.
+RESPONSE_CACHE_PATH = os.path.join(tempfile.gettempdir(), "compare_ai_quality_cache.json")
+RESPONSE_CACHE_TTL_SECONDS = 24 * 60 * 60
+_response_cache = {}
+
+def load_response_cache():
+    try:
+        with open(RESPONSE_CACHE_PATH, 'r') as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return
+    if not isinstance(entries, dict):
+        return
+    oldest = time.time() - RESPONSE_CACHE_TTL_SECONDS
+    _response_cache.update({
+        key: entry for key, entry in entries.items()
+        if isinstance(entry, dict) and entry.get('source') == 'azure'
+        and entry.get('stored_at', 0) > oldest
+    })
+
+def save_response_cache():
+    try:
+        with open(RESPONSE_CACHE_PATH, 'w') as f:
+            json.dump(_response_cache, f)
+    except (OSError, TypeError) as e:
+        print(f"⚠️  Could not save response cache: {e}")
+
+def store_response(key, result, azure_configured):
+    """Keep a successful response for later runs if it really came from Azure"""
+    if azure_configured and not result.get('error'):
+        _response_cache[key] = {'source': 'azure', 'stored_at': time.time(), 'result': result}
+
+def cached_azure_call(kind, analyze, value, azure_configured):
+    """Call an Azure analysis function, reusing a stored Azure response"""
+    key = f"{kind}:{value}"
+    entry = _response_cache.get(key)
+    if entry is not None:
+        return entry['result']
+    result = analyze(value)
+    store_response(key, result, azure_configured)
+    return result
+
+def cached_sentiment_batch(texts):
+    """Azure sentiment for several texts, sending only unstored ones, in one batch"""
+    from services.azure_cognitive_services import analyze_sentiment_batch, _text_analytics_client
+    
+    keys = [f"sentiment:{text}" for text in texts]
+    results = [_response_cache[key]['result'] if key in _response_cache else None for key in keys]
+    pending = [index for index, result in enumerate(results) if result is None]
+    if pending:
+        azure_configured = _text_analytics_client() is not None
+        for index, result in zip(pending, analyze_sentiment_batch([texts[index] for index in pending])):
+            results[index] = result
+            store_response(keys[index], result, azure_configured)
+    return results
+
+# Test URLs for different product types
+TEST_IMAGES = [
+    {
+        "category": "Jewelry", 
+        "url": "https://images.unsplash.com/photo-1515562141207-7a88fb7ce338?w=500",
+        "description": "Gold necklace on book"
+    },
+    {
+        "category": "Home Decor", 
+        "url": "https://images.unsplash.com/photo-1586023492125-27b2c045efd7?w=500",
+        "description": "Ceramic vase with plants"
+    },
+    {
+        "category": "Art/Crafts",
+        "url": "https://images.unsplash.com/photo-1513475382585-d06e58bcb0e0?w=500", 
+        "description": "Handmade pottery"
+    }
+]
+
+# Test reviews for different sentiments
+TEST_REVIEWS = [
+    {
+        "type": "Very Positive",
+        "text": "This handmade jewelry is absolutely stunning! The craftsmanship is incredible and it exceeded all my expectations. Highly recommend!"
+    },
+    {
+        "type": "Very Negative", 
+        "text": "Terrible quality! The necklace broke after just one day. Complete waste of money. Very disappointed with this purchase."
+    },
+    {
+        "type": "Mixed/Neutral",
+        "text": "The product is okay. Quality is decent for the price, nothing special but does the job. Shipping was fast."
+    },
+    {
+        "type": "Complex Sentiment",
+        "text": "I love the design and style of this bracelet, it's exactly what I wanted. However, the delivery took too long and the packaging was damaged."
+    }
+]
+
+# Every comparison call is an independent network round-trip, so they are all
+# submitted up front and the report is printed in test order as they finish
+
+def submit_image_analyses(executor):
+    """Submit Azure and simulator analyses of TEST_IMAGES"""
+    from services.azure_cognitive_services import analyze_image_from_url, _computervision_client
+    from services.azure_ai_simulator import azure_simulator
+    
+    # Without credentials analyze_image_from_url falls back to the simulator
+    azure_configured = _computervision_client() is not None
+    azure_futures = [
+        executor.submit(cached_azure_call, 'image', analyze_image_from_url, t['url'], azure_configured)
+        for t in TEST_IMAGES
+    ]
+    simulator_futures = [executor.submit(azure_simulator.analyze_image_from_url, t['url']) for t in TEST_IMAGES]
+    return azure_futures, simulator_futures
+
+def submit_sentiment_analyses(executor):
+    """Submit Azure (one batch request) and simulator sentiment of TEST_REVIEWS"""
+    from services.azure_ai_simulator import azure_simulator
+    
+    azure_future = executor.submit(cached_sentiment_batch, [t['text'] for t in TEST_REVIEWS])
+    simulator_futures = [executor.submit(azure_simulator.analyze_sentiment, t['text']) for t in TEST_REVIEWS]
+    return azure_future, simulator_futures
+
+def test_image_analysis_comparison(pending=None):
+    """Compare image analysis between simulator and real Azure
+    
+    pending is the (azure, simulator) futures from submit_image_analyses;
+    the calls are submitted here when it is not given.
+    """
     print("\n🖼️  IMAGE ANALYSIS COMPARISON")
     print("=" * 70)
     
-    # Test URLs for different product types
-    test_images = [
-        {
-            "category": "Jewelry", 
-            "url": "https://images.unsplash.com/photo-1515562141207-7a88fb7ce338?w=500",
-            "description": "Gold necklace on book"
-        },
-        {
-            "category": "Home Decor", 
-            "url": "https://images.unsplash.com/photo-1586023492125-27b2c045efd7?w=500",
-            "description": "Ceramic vase with plants"
-        },
-        {
-            "category": "Art/Crafts",
-            "url": "https://images.unsplash.com/photo-1513475382585-d06e58bcb0e0?w=500", 
-            "description": "Handmade pottery"
-        }
-    ]
     
-    # Import both services
-    from services.azure_cognitive_services import analyze_image_from_url
-    from services.azure_ai_simulator import azure_simulator
+    if pending is None:
+        with ThreadPoolExecutor(max_workers=len(TEST_IMAGES) * 2) as executor:
+            pending = submit_image_analyses(executor)
+    azure_futures, simulator_futures = pending
+    test_images = TEST_IMAGES
     
     results = []
     
@@ -65,7 +178,7 @@ def test_image_analysis_comparison():
         # Test with Real Azure
         print("🌩️  REAL AZURE AI:")
         try:
-            azure_result = analyze_image_from_url(test_image['url'])
+            azure_result = azure_futures[i].result()
             print(f"   📝 Description: {azure_result.get('description', 'N/A')}")
             azure_tags = azure_result.get('tags', [])[:5]
             print(f"   🏷️  Tags: {', '.join(azure_tags)}")
@@ -78,7 +191,7 @@ def test_image_analysis_comparison():
         # Test with Simulator
         print("🤖 AI SIMULATOR:")
         try:
-            simulator_result = azure_simulator.analyze_image_from_url(test_image['url'])
+            simulator_result = simulator_futures[i].result()
             print(f"   📝 Description: {simulator_result.get('description', 'N/A')}")
             sim_tags = [tag['name'] for tag in simulator_result.get('tags', [])[:5]]
             print(f"   🏷️  Tags: {', '.join(sim_tags)}")
@@ -96,34 +209,22 @@ def test_image_analysis_comparison():
     
     return results
 
-def test_sentiment_analysis_comparison():
-    """Compare sentiment analysis between simulator and real Azure"""
+def test_sentiment_analysis_comparison(pending=None):
+    """Compare sentiment analysis between simulator and real Azure
+    
+    pending is the (azure, simulator) futures from
+    submit_sentiment_analyses; the calls are submitted here when it is not
+    given.
+    """
     print("\n📝 SENTIMENT ANALYSIS COMPARISON")
     print("=" * 70)
     
-    # Test reviews for different sentiments
-    test_reviews = [
-        {
-            "type": "Very Positive",
-            "text": "This handmade jewelry is absolutely stunning! The craftsmanship is incredible and it exceeded all my expectations. Highly recommend!"
-        },
-        {
-            "type": "Very Negative", 
-            "text": "Terrible quality! The necklace broke after just one day. Complete waste of money. Very disappointed with this purchase."
-        },
-        {
-            "type": "Mixed/Neutral",
-            "text": "The product is okay. Quality is decent for the price, nothing special but does the job. Shipping was fast."
-        },
-        {
-            "type": "Complex Sentiment",
-            "text": "I love the design and style of this bracelet, it's exactly what I wanted. However, the delivery took too long and the packaging was damaged."
-        }
-    ]
     
-    # Import both services
-    from services.azure_cognitive_services import analyze_sentiment
-    from services.azure_ai_simulator import azure_simulator
+    if pending is None:
+        with ThreadPoolExecutor(max_workers=len(TEST_REVIEWS) + 1) as executor:
+            pending = submit_sentiment_analyses(executor)
+    azure_future, simulator_futures = pending
+    test_reviews = TEST_REVIEWS
     
     results = []
     
@@ -135,7 +236,7 @@ def test_sentiment_analysis_comparison():
         # Test with Real Azure
         print("🌩️  REAL AZURE AI:")
         try:
-            azure_result = analyze_sentiment(test_review['text'])
+            azure_result = azure_future.result()[i]
             print(f"   😊 Sentiment: {azure_result.get('sentiment', 'N/A').upper()}")
             print(f"   📊 Scores: Pos={azure_result.get('positive_score', 0):.2f}, "
                   f"Neu={azure_result.get('neutral_score', 0):.2f}, "
@@ -147,7 +248,7 @@ def test_sentiment_analysis_comparison():
         # Test with Simulator
         print("🤖 AI SIMULATOR:")
         try:
-            simulator_result = azure_simulator.analyze_sentiment(test_review['text'])
+            simulator_result = simulator_futures[i].result()
             print(f"   😊 Sentiment: {simulator_result.get('sentiment', 'N/A').upper()}")
             scores = simulator_result.get('confidence_scores', {})
             print(f"   📊 Scores: Pos={scores.get('positive', 0):.2f}, "
@@ -165,6 +266,13 @@ def test_sentiment_analysis_comparison():
     
     return results
 
+# Sentiment class scores as reported by Azure and by the simulator
+AZURE_SCORE_KEYS = ('positive_score', 'neutral_score', 'negative_score')
+SIMULATOR_SCORE_KEYS = ('positive', 'neutral', 'negative')
+
+def max_confidence(scores, keys):
+    return max(scores.get(key, 0) for key in keys)
+
 def analyze_accuracy_comparison(image_results, sentiment_results):
     """Analyze and compare accuracy between services"""
     print("\n📊 ACCURACY & QUALITY ANALYSIS")
@@ -209,32 +317,32 @@ def analyze_accuracy_comparison(image_results, sentiment_results):
     
     # Sentiment Analysis Comparison
     print(f"\n📝 SENTIMENT ANALYSIS QUALITY:")
-    sentiment_score_azure = 0
-    sentiment_score_simulator = 0
+    # Highest class confidence per review, or None where the service errored
+    azure_confidences = [
+        None if result.get('azure', {}).get('error')
+        else max_confidence(result.get('azure', {}), AZURE_SCORE_KEYS)
+        for result in sentiment_results
+    ]
+    simulator_confidences = [
+        None if result.get('simulator', {}).get('error')
+        else max_confidence(result.get('simulator', {}).get('confidence_scores', {}), SIMULATOR_SCORE_KEYS)
+        for result in sentiment_results
+    ]
+    sentiment_score_azure = sum(c for c in azure_confidences if c is not None)
+    sentiment_score_simulator = sum(c for c in simulator_confidences if c is not None)
     
-    for result in sentiment_results:
+    for result, azure_confidence, simulator_confidence in zip(sentiment_results, azure_confidences, simulator_confidences):
         print(f"\n📄 {result['review']['type']}:")
         
         # Check Azure confidence
-        azure = result.get('azure', {})
-        if not azure.get('error'):
-            max_confidence = max(azure.get('positive_score', 0), 
-                               azure.get('neutral_score', 0), 
-                               azure.get('negative_score', 0))
-            print(f"   🌩️  Azure Confidence: {max_confidence:.2f}")
-            sentiment_score_azure += max_confidence
+        if azure_confidence is not None:
+            print(f"   🌩️  Azure Confidence: {azure_confidence:.2f}")
         else:
             print(f"   🌩️  Azure: Error")
         
         # Check Simulator confidence
-        simulator = result.get('simulator', {})
-        if not simulator.get('error'):
-            scores = simulator.get('confidence_scores', {})
-            max_confidence = max(scores.get('positive', 0), 
-                               scores.get('neutral', 0), 
-                               scores.get('negative', 0))
-            print(f"   🤖 Simulator Confidence: {max_confidence:.2f}")
-            sentiment_score_simulator += max_confidence
+        if simulator_confidence is not None:
+            print(f"   🤖 Simulator Confidence: {simulator_confidence:.2f}")
         else:
             print(f"   🤖 Simulator: Error")
     
@@ -268,19 +376,35 @@ def analyze_accuracy_comparison(image_results, sentiment_results):
 
 def main():
     """Run comprehensive AI quality comparison"""
+    # Block-buffer the report and flush once per section instead of writing
+    # on every line when attached to a terminal
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+    
     print("🔍 AI QUALITY COMPARISON: SIMULATOR vs REAL AZURE")
     print("=" * 80)
     print(f"⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    sys.stdout.flush()
     
     # Load environment
     load_env_vars()
+    if "--no-cache" not in sys.argv[1:]:
+        load_response_cache()
     
-    # Run comparisons
-    image_results = test_image_analysis_comparison()
-    sentiment_results = test_sentiment_analysis_comparison()
+    # Run comparisons; all Azure and simulator calls of both sections are in
+    # flight together while the image section is reported
+    with ThreadPoolExecutor(max_workers=len(TEST_IMAGES) * 2 + len(TEST_REVIEWS) + 1) as executor:
+        pending_images = submit_image_analyses(executor)
+        pending_sentiments = submit_sentiment_analyses(executor)
+        image_results = test_image_analysis_comparison(pending_images)
+        sys.stdout.flush()
+        sentiment_results = test_sentiment_analysis_comparison(pending_sentiments)
+        sys.stdout.flush()
+    save_response_cache()
     
     # Analyze results
     analyze_accuracy_comparison(image_results, sentiment_results)
+    sys.stdout.flush()
     
     print(f"\n⏰ Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("🎉 Comparison complete! Real Azure AI is now active for production-level accuracy!")
@@ -12,6 +12,8 @@ This script launches the complete production system with all features:
 import os
 import sys
 import time
+import select
+import signal
 import subprocess
 import threading
 from datetime import datetime
@@ -20,10 +22,23 @@ from dotenv import load_dotenv
 class ProductionSystemLauncher:
     """Production system launcher"""
     
+    # Seconds a component needs after spawning before it is usable. The
+    # components do not depend on each other, so they are all spawned first
+    # and the launcher waits once for the slowest instead of after each.
+    STARTUP_GRACE_SECONDS = {
+        'realtime_engine': 3,
+        'production_server': 5
+    }
+    
+    # Minimum seconds between restarts of one component, so a component that
+    # crashes on startup is not respawned in a tight loop
+    RESTART_BACKOFF_SECONDS = 10
+    
     def __init__(self):
         self.load_dotenv()
         self.processes = {}
         self.threads = {}
+        self.last_restart = {}
         self.running = False
         
     def load_dotenv(self):
@@ -62,6 +77,10 @@ class ProductionSystemLauncher:
             print("\n🤖 4. Starting AI Insights Engine...")
             self.start_ai_insights_engine()
             
+            # Let the components initialize concurrently
+            print("\n⏳ Waiting for components to initialize...")
+            time.sleep(max(self.STARTUP_GRACE_SECONDS.values()))
+            
             print("\n🎉 All production components started successfully!")
             print("=" * 70)
             
@@ -125,9 +144,6 @@ class ProductionSystemLauncher:
             self.processes['realtime_engine'] = process
             print("   ✅ Real-time analysis engine started")
             
-            # Wait a moment for engine to initialize
-            time.sleep(3)
-            
         except Exception as e:
             print(f"   ❌ Failed to start real-time engine: {e}")
     
@@ -156,9 +172,6 @@ class ProductionSystemLauncher:
             self.processes['production_server'] = process
             print("   ✅ Production server started")
             
-            # Wait for server to start
-            time.sleep(5)
-            
         except Exception as e:
             print(f"   ❌ Failed to start production server: {e}")
     
@@ -202,20 +215,69 @@ class ProductionSystemLauncher:
     def keep_system_running(self):
         """Keep the production system running"""
         try:
-            while self.running:
-                # Check if all processes are still running
-                for component, process in self.processes.items():
-                    if process.poll() is not None:
-                        print(f"⚠️  {component} has stopped unexpectedly")
-                        # Restart component
-                        self.restart_component(component)
-                
-                time.sleep(10)
+            if hasattr(signal, 'SIGCHLD'):
+                self._supervise_on_child_exit()
+            else:
+                # No SIGCHLD (Windows): fall back to polling the children
+                while self.running:
+                    self.restart_stopped_components()
+                    time.sleep(10)
                 
         except KeyboardInterrupt:
             print("\n🛑 Shutdown requested by user")
             self.shutdown_production_system()
     
+    def _supervise_on_child_exit(self):
+        """Sleep until a child process exits, then restart what stopped
+        
+        SIGCHLD is routed to a self-pipe with signal.set_wakeup_fd, so the
+        supervisor blocks in select() and only wakes when a child actually
+        dies (or on Ctrl+C), instead of polling every component on a timer.
+        """
+        wakeup_r, wakeup_w = os.pipe()
+        os.set_blocking(wakeup_r, False)
+        os.set_blocking(wakeup_w, False)
+        # A Python-level handler is required for the wakeup fd to be written;
+        # the default SIGCHLD disposition discards the signal
+        previous_handler = signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+        previous_wakeup_fd = signal.set_wakeup_fd(wakeup_w)
+        
+        try:
+            while self.running:
+                # Also covers children that died before the handler existed
+                retry_in = self.restart_stopped_components()
+                select.select([wakeup_r], [], [], retry_in)
+                try:
+                    while os.read(wakeup_r, 512):
+                        pass
+                except BlockingIOError:
+                    pass
+        finally:
+            signal.set_wakeup_fd(previous_wakeup_fd)
+            signal.signal(signal.SIGCHLD, previous_handler)
+            os.close(wakeup_r)
+            os.close(wakeup_w)
+    
+    def restart_stopped_components(self):
+        """Restart every component whose process has exited
+        
+        Returns the seconds until a stopped component that is still backing
+        off may be restarted, or None when nothing is waiting.
+        """
+        retry_in = None
+        now = time.monotonic()
+        for component, process in list(self.processes.items()):
+            if process.poll() is not None:
+                wait = self.last_restart.get(component, float('-inf')) + self.RESTART_BACKOFF_SECONDS - now
+                if wait > 0:
+                    retry_in = wait if retry_in is None else min(retry_in, wait)
+                    continue
+                print(f"⚠️  {component} has stopped unexpectedly")
+                # Restart component
+                self.last_restart[component] = now
+                self.restart_component(component)
+        return retry_in
+    
     def restart_component(self, component):
         """Restart a failed component"""
         print(f"🔄 Restarting {component}...")